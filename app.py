@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 from fastapi import FastAPI, HTTPException, BackgroundTasks, WebSocket, WebSocketDisconnect, Depends, status, Request
-from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from fastapi.middleware.cors import CORSMiddleware
@@ -11,15 +11,18 @@ import asyncio
 import os
 import shutil
 import uuid
-from datetime import datetime, timedelta
-import importlib
-import re
+import time
+from collections import OrderedDict
+from itertools import islice
+from datetime import datetime, timedelta, timezone
 from urllib.parse import urlparse
 import logging
 import zipfile
-from io import BytesIO
+import mmap
+import tempfile
 import aiohttp
 import json
+import orjson
 import secrets
 from passlib.context import CryptContext
 import jwt
@@ -32,6 +35,7 @@ from database import (
     init_db_pool, close_db_pool, log_download_request,
     update_download_status, get_download_stats
 )
+import job_store
 import posthog
 
 # Load environment variables
@@ -62,7 +66,8 @@ else:
 import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from player_info import get_player_info
-from downloader import download_tracks
+from scrapers import get_scraper
+from downloader import download_tracks, close_shared_session, remove_if_exists, sanitize_filename as sanitize_track_name
 from security import validate_url, sanitize_filename, validate_safe_path, is_valid_job_id
 
 app = FastAPI(title="AudioFetch", version="2.0.0")
@@ -144,11 +149,16 @@ CONTACT_EMAIL = os.getenv("CONTACT_EMAIL")
 # Store active websocket connections
 active_connections: Dict[str, WebSocket] = {}
 
-# Store download jobs and cancellation flags
-download_jobs = {}
+# Store download jobs (oldest first, capped at MAX_JOBS) and cancellation flags
+MAX_JOBS = 1024
+# Jobs in these states are still running and are never evicted
+ACTIVE_JOB_STATUSES = ('pending', 'detecting', 'downloading', 'streaming')
+download_jobs: "OrderedDict[str, dict]" = OrderedDict()
 cancel_flags = {}
 # Track which connection initiated each job
 job_owners = {}  # job_id -> connection_id mapping
+# Serialize on-demand ZIP builds per download directory
+zip_build_locks: Dict[str, asyncio.Lock] = {}
 
 class DownloadRequest(BaseModel):
     url: HttpUrl
@@ -167,6 +177,7 @@ class DownloadStatus(BaseModel):
     result: Optional[Dict] = None
     created_at: datetime
     completed_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
     download_name: Optional[str] = None
     download_mode: Optional[str] = None
 
@@ -177,6 +188,25 @@ class Token(BaseModel):
 class LoginRequest(BaseModel):
     password: str
 
+def register_job(job_id: str, job: dict):
+    """Store a new job, evicting the oldest finished jobs once MAX_JOBS is exceeded."""
+    download_jobs[job_id] = job
+    download_jobs.move_to_end(job_id)
+    excess = len(download_jobs) - MAX_JOBS
+    if excess <= 0:
+        return
+    
+    # Running jobs stay, even if that keeps the store over MAX_JOBS for a while
+    finished = list(islice(
+        (finished_id for finished_id, finished_job in download_jobs.items()
+         if finished_job.get('status') not in ACTIVE_JOB_STATUSES),
+        excess
+    ))
+    for evicted_id in finished:
+        del download_jobs[evicted_id]
+        cancel_flags.pop(evicted_id, None)
+        job_owners.pop(evicted_id, None)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -197,36 +227,98 @@ def verify_token(token: str):
     except PyJWTError:
         return False
 
-async def send_job_update(websocket: WebSocket, job_id: str, job_data: dict):
-    """Send job update to a specific websocket."""
+def job_update_message(job_id: str, job_data: dict) -> dict:
+    """Build the websocket message for a job update."""
     # Create a serializable copy of the job data
     serializable_data = job_data.copy()
     
-    # Convert datetime objects to ISO format strings
-    if 'created_at' in serializable_data and isinstance(serializable_data['created_at'], datetime):
-        serializable_data['created_at'] = serializable_data['created_at'].isoformat()
-    if 'completed_at' in serializable_data and isinstance(serializable_data['completed_at'], datetime):
-        serializable_data['completed_at'] = serializable_data['completed_at'].isoformat()
+    # Use the ISO strings cached when the timestamps were set
+    serializable_data.pop('_start_mono', None)
+    for key in ('created_at', 'completed_at'):
+        iso = serializable_data.pop(f'_{key}_iso', None)
+        if iso is not None:
+            serializable_data[key] = iso
+        elif isinstance(serializable_data.get(key), datetime):
+            serializable_data[key] = serializable_data[key].isoformat()
     
     # Remove non-serializable objects
     serializable_data.pop('request', None)
     serializable_data.pop('tracks', None)
+    serializable_data.pop('owner', None)
     
-    message = {
+    return {
         "type": "job_update",
         "job_id": job_id,
         "data": serializable_data
     }
+
+def encode_message(message: dict) -> str:
+    """Serialize a websocket message once, as the text frame the client expects."""
+    return orjson.dumps(message).decode()
+
+async def send_job_update(websocket: WebSocket, job_id: str, job_data: dict):
+    """Send job update to a specific websocket."""
+    payload = encode_message(job_update_message(job_id, job_data))
     
     try:
-        await websocket.send_json(message)
+        await websocket.send_text(payload)
     except Exception as e:
         logger.warning(f"Failed to send to websocket: {e}")
 
+def finish_job(job: dict, status: str, message: str):
+    """Move a job to a terminal status and record its completion time."""
+    now = datetime.now(timezone.utc)
+    job['status'] = status
+    job['message'] = message
+    job['completed_at'] = now
+    job['_completed_at_iso'] = now.isoformat()
+    # Jobs adopted from another worker have no local start time
+    if '_start_mono' in job:
+        job['duration_seconds'] = time.monotonic() - job['_start_mono']
+
+async def save_job_state(job_id: str, job: dict):
+    """Save a job snapshot to the shared job store, if one is configured."""
+    if not job_store.is_enabled():
+        return
+    
+    snapshot = job_update_message(job_id, job)['data']
+    snapshot.pop('auto_download', None)
+    snapshot['tracks'] = job.get('tracks')
+    snapshot['owner'] = job_owners.get(job_id, job.get('owner'))
+    await job_store.save_job(job_id, snapshot)
+
+async def get_job(job_id: str) -> Optional[dict]:
+    """
+    Look up a job locally, falling back to the shared job store. Jobs run by
+    another worker are read fresh on every call and never cached here, since
+    only their owner keeps them up to date; the snapshot keeps its 'owner'.
+    """
+    job = download_jobs.get(job_id)
+    if job is not None or not job_store.is_enabled():
+        return job
+    return await job_store.load_job(job_id)
+
+async def is_job_cancelled(job_id: str) -> bool:
+    """Check the local and shared cancellation flags for a job."""
+    return cancel_flags.get(job_id, False) or await job_store.is_cancelled(job_id)
+
+async def deliver_job_update(update: dict):
+    """Send a job update relayed through the job store to its local owner."""
+    owner_conn_id = update.get('owner')
+    if owner_conn_id and owner_conn_id in active_connections:
+        try:
+            await active_connections[owner_conn_id].send_text(encode_message(update['message']))
+        except Exception as e:
+            logger.warning(f"Failed to send to job owner {owner_conn_id}: {e}")
+            active_connections.pop(owner_conn_id, None)
+
 async def broadcast_job_update(job_id: str, job_data: dict):
     """Send job updates only to the connection that owns the job."""
-    # Check if this job has an owner
-    owner_conn_id = job_owners.get(job_id)
+    # Check if this job has an owner (snapshots from other workers carry their own)
+    owner_conn_id = job_owners.get(job_id, job_data.get('owner'))
+    
+    if job_store.is_enabled():
+        await save_job_state(job_id, job_data)
     
     if owner_conn_id and owner_conn_id in active_connections:
         # Send update only to the owner
@@ -237,6 +329,13 @@ async def broadcast_job_update(job_id: str, job_data: dict):
             # Clean up disconnected websocket
             active_connections.pop(owner_conn_id, None)
             job_owners.pop(job_id, None)
+    elif owner_conn_id and job_store.is_enabled():
+        # The owner is connected to another worker, so publish the update
+        # and let that worker deliver it to its websocket
+        await job_store.publish_job_update({
+            'owner': owner_conn_id,
+            'message': job_update_message(job_id, job_data)
+        })
     else:
         # If no owner or owner disconnected, clean up job owner tracking
         if job_id in job_owners:
@@ -246,13 +345,20 @@ async def broadcast_job_update(job_id: str, job_data: dict):
 async def stream_zip_truly(tracks: List[Dict], job_id: str) -> AsyncGenerator[bytes, None]:
     """
     True streaming ZIP generation - sends data as soon as it's downloaded.
+    
+    Each member is written with general purpose bit 3 set, so its data can be
+    sent chunk by chunk before its CRC and size are known; those follow the
+    data in a data descriptor and are repeated in the central directory.
     """
     import struct
     import zlib
     import time
     
-    def create_local_header(filename: str, size: int, crc: int) -> bytes:
-        """Create ZIP local file header"""
+    # General purpose flag: CRC and sizes are in the data descriptor
+    DATA_DESCRIPTOR_FLAG = 0x08
+    
+    def create_local_header(filename: str) -> bytes:
+        """Create ZIP local file header, leaving CRC and sizes to the data descriptor"""
         dt = time.localtime()
         dosdate = (dt.tm_year - 1980) << 9 | dt.tm_mon << 5 | dt.tm_mday
         dostime = dt.tm_hour << 11 | dt.tm_min << 5 | (dt.tm_sec // 2)
@@ -261,18 +367,28 @@ async def stream_zip_truly(tracks: List[Dict], job_id: str) -> AsyncGenerator[by
             '<4sHHHHHIIIHH',  # Local file header format
             b'PK\x03\x04',  # Local file header signature
             0x14,  # Version needed to extract (2.0)
-            0,   # General purpose bit flag
+            DATA_DESCRIPTOR_FLAG,  # General purpose bit flag
             0,   # Compression method (0 = stored)
             dostime,  # Last mod file time
             dosdate,  # Last mod file date
-            crc,  # CRC-32
-            size,  # Compressed size
-            size,  # Uncompressed size
+            0,   # CRC-32 (in data descriptor)
+            0,   # Compressed size (in data descriptor)
+            0,   # Uncompressed size (in data descriptor)
             len(filename.encode('utf-8')),  # File name length
             0    # Extra field length
         )
         return header + filename.encode('utf-8')
     
+    def create_data_descriptor(size: int, crc: int) -> bytes:
+        """Create ZIP data descriptor following a member's data"""
+        return struct.pack(
+            '<4sIII',
+            b'PK\x07\x08',  # Data descriptor signature
+            crc,   # CRC-32
+            size,  # Compressed size
+            size   # Uncompressed size
+        )
+    
     def create_central_header(filename: str, size: int, crc: int, offset: int) -> bytes:
         """Create ZIP central directory header"""
         dt = time.localtime()
@@ -284,7 +400,7 @@ async def stream_zip_truly(tracks: List[Dict], job_id: str) -> AsyncGenerator[by
             b'PK\x01\x02',  # Central file header signature
             0x314,  # Version made by (3.1 Unix)
             0x14,   # Version needed to extract (2.0)
-            0,      # General purpose bit flag
+            DATA_DESCRIPTOR_FLAG,  # General purpose bit flag
             0,      # Compression method
             dostime,  # Last mod file time
             dosdate,  # Last mod file date
@@ -310,13 +426,13 @@ async def stream_zip_truly(tracks: List[Dict], job_id: str) -> AsyncGenerator[by
     async with aiohttp.ClientSession() as session:
         # Stream each file as it downloads
         for idx, track in enumerate(tracks):
-            if cancel_flags.get(job_id, False):
+            if await is_job_cancelled(job_id):
                 logger.info(f"[Job {job_id[:8]}] Cancelled")
                 break
                 
             try:
                 filename = track.get('filename', track['url'].split('/')[-1])
-                if not any(filename.endswith(ext) for ext in ['.mp3', '.m4a', '.aac', '.ogg', '.opus', '.webm', '.wav', '.flac']):
+                if not is_audio_file(filename):
                     filename += '.mp3'
                 
                 logger.info(f"[Job {job_id[:8]}] Streaming track {idx+1}/{len(tracks)}: {filename}")
@@ -325,31 +441,38 @@ async def stream_zip_truly(tracks: List[Dict], job_id: str) -> AsyncGenerator[by
                 async with session.get(track['url']) as response:
                     response.raise_for_status()
                     
-                    # Collect chunks to calculate CRC
-                    chunks = []
-                    async for chunk in response.content.iter_chunked(1024 * 1024):  # 1MB chunks
-                        chunks.append(chunk)
-                    
-                    file_data = b''.join(chunks)
-                    crc = zlib.crc32(file_data) & 0xffffffff
-                    size = len(file_data)
-                    
                     # Write local header
-                    header = create_local_header(filename, size, crc)
+                    member_offset = current_offset
+                    header = create_local_header(filename)
                     yield header
+                    current_offset += len(header)
+                    
+                    # Send each chunk as it arrives, updating the CRC as we go
+                    crc = 0
+                    size = 0
+                    try:
+                        async for chunk in response.content.iter_chunked(1024 * 1024):  # 1MB chunks
+                            crc = zlib.crc32(chunk, crc)
+                            size += len(chunk)
+                            yield chunk
+                    finally:
+                        # A member cut off mid-download stays out of the central
+                        # directory, but its bytes are already in the stream
+                        current_offset += size
+                    crc &= 0xffffffff
                     
-                    # Stream file data
-                    yield file_data
+                    descriptor = create_data_descriptor(size, crc)
+                    yield descriptor
                     
                     # Save record for central directory
                     file_records.append({
                         'filename': filename,
                         'size': size,
                         'crc': crc,
-                        'offset': current_offset
+                        'offset': member_offset
                     })
                     
-                    current_offset += len(header) + size
+                    current_offset += len(descriptor)
                     completed += 1
                     
                     # Update progress
@@ -401,80 +524,105 @@ async def stream_zip_truly(tracks: List[Dict], job_id: str) -> AsyncGenerator[by
     logger.info(f"[Job {job_id[:8]}] Streaming complete: {completed}/{len(tracks)} successful")
 
 def detect_plugin(url):
-    """Detect which audio streaming plugin a website is using."""
-    import requests
+    """
+    Detect which audio streaming plugin a website is using.
+    Returns the detections and the page response, so the scraper can reuse it.
+    """
     from bs4 import BeautifulSoup
+    from scrapers.parsing import HTML_PARSER, AudioLinkFilter, detect_players
+    from scrapers.session import PAGE_SESSION
     
     try:
         logger.info(f"Detecting plugin for URL: {url}")
-        response = requests.get(str(url), timeout=30)
+        response = PAGE_SESSION.get(str(url), timeout=30)
         response.raise_for_status()
-        html = response.text.lower()
-        html_original = response.text
         
-        detections = []
+        detections = detect_players(response.content)
+        for name, supported in detections:
+            logger.debug(f"Detected {name} player" + ("" if supported else " (unsupported)"))
         
-        if 'plyr' in html or 'new plyr' in html:
-            detections.append(('plyr', True))
-            logger.debug("Detected Plyr player")
-        
-        if 'howler' in html or 'howl(' in html or 'howler.js' in html:
-            detections.append(('howler', False))
-            logger.debug("Detected Howler (unsupported)")
-        
-        mediaelement_patterns = [
-            'mediaelement', 'mejsplayer', 'mejs', 'mejs-',
-            'wp-mediaelement', 'mediaelement-and-player',
-            'mediaelementplayer', 'mejs__'
-        ]
-        if any(pattern in html for pattern in mediaelement_patterns):
-            detections.append(('mediaelement', False))
-            logger.debug("Detected MediaElement (unsupported)")
-        
-        if 'video-js' in html or 'videojs' in html:
-            detections.append(('videojs', False))
-            logger.debug("Detected VideoJS (unsupported)")
-        
-        if 'jwplayer' in html or 'jwplatform' in html:
-            detections.append(('jwplayer', False))
-            logger.debug("Detected JWPlayer (unsupported)")
-        
-        if '<audio' in html:
-            detections.append(('html5audio', False))
-            logger.debug("Detected HTML5 Audio (unsupported)")
-        
-        if 'soundcloud.com' in html or 'soundcloud-widget' in html:
-            detections.append(('soundcloud', False))
-            logger.debug("Detected SoundCloud (unsupported)")
-        
-        if 'spotify.com/embed' in html:
-            detections.append(('spotify', False))
-            logger.debug("Detected Spotify (unsupported)")
-        
-        soup = BeautifulSoup(html_original, 'html.parser')
-        mp3_links = soup.find_all(lambda tag: 
-            (tag.name == 'a' and tag.get('href', '').endswith('.mp3')) or
-            (tag.get('data-url', '').endswith('.mp3'))
-        )
-        if mp3_links:
-            detections.append(('simple_mp3', True))
-            logger.debug(f"Detected {len(mp3_links)} direct MP3 links")
+        # Plain audio links are only a fallback, so skip parsing the page
+        # when a supported player was already found
+        if not any(supported for _, supported in detections):
+            # Only the audio links themselves are built into the tree
+            soup = BeautifulSoup(response.content, HTML_PARSER, parse_only=AudioLinkFilter())
+            audio_links = soup.contents
+            if audio_links:
+                detections.append(('simple_mp3', True))
+                logger.debug(f"Detected {len(audio_links)} direct audio links")
         
         logger.info(f"Detection complete. Found {len(detections)} players")
-        return detections
+        return detections, response
         
     except Exception as e:
         logger.error(f"Error detecting plugin: {str(e)}")
         raise HTTPException(status_code=400, detail=f"Error detecting plugin: {str(e)}")
 
+# Extensions of the audio files served from download directories
+AUDIO_EXTENSIONS = frozenset({'.mp3', '.m4a', '.aac', '.ogg', '.opus', '.webm', '.wav', '.flac'})
+
+def is_audio_file(name: str) -> bool:
+    """Check a filename's extension against AUDIO_EXTENSIONS."""
+    return name[name.rfind('.'):].lower() in AUDIO_EXTENSIONS
+
+# Slice size used when copying memory-mapped files into a ZIP
+ZIP_COPY_CHUNK = 1 << 20
+
+def write_zip_member(zip_file: zipfile.ZipFile, file_path: str, arcname: str):
+    """Copy a file into an open ZIP from a memory map instead of read() calls."""
+    info = zipfile.ZipInfo.from_file(file_path, arcname)
+    info.compress_type = zipfile.ZIP_STORED
+    
+    with open(file_path, 'rb') as f, zip_file.open(info, 'w') as dest:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            # Empty files cannot be memory-mapped
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mapped, 'madvise'):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            with memoryview(mapped) as view:
+                for i in range(0, size, ZIP_COPY_CHUNK):
+                    dest.write(view[i:i + ZIP_COPY_CHUNK])
+
+def build_zip(dir_path: str, zip_path: str):
+    """Build a stored (uncompressed) ZIP of the audio files in dir_path."""
+    # Write to a unique temp file first so a partial archive is never served
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(zip_path) or '.', prefix=f"{os.path.basename(zip_path)}.", suffix='.tmp'
+    )
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file, zipfile.ZipFile(tmp_file, 'w', zipfile.ZIP_STORED) as zip_file:
+            for file in sorted(os.listdir(dir_path)):
+                if is_audio_file(file):
+                    file_path = os.path.join(dir_path, file)
+                    write_zip_member(zip_file, file_path, file)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, zip_path)
+    except BaseException:
+        remove_if_exists(tmp_path)
+        raise
+    logger.info(f"ZIP cached at {zip_path}, size: {os.path.getsize(zip_path)} bytes")
+
+async def refresh_cached_zip(name: str, dir_path: str, rebuild: bool = False):
+    """
+    Drop the cached ZIP of a download directory whose contents changed,
+    building a fresh one if rebuild is set. Runs under the directory's
+    ZIP lock so it never overlaps an on-demand build.
+    """
+    zip_path = f"{dir_path}.zip"
+    async with zip_build_locks.setdefault(name, asyncio.Lock()):
+        await asyncio.to_thread(remove_if_exists, zip_path)
+        if rebuild:
+            await asyncio.to_thread(build_zip, dir_path, zip_path)
+
 def generate_name_from_url(url: str) -> str:
     """Generate a name from URL if none provided."""
     parsed_url = urlparse(url)
     path_parts = [p for p in parsed_url.path.strip('/').split('/') if p]
     
     if path_parts:
-        name = re.sub(r'[^\w\s-]', '', path_parts[-1])
-        name = re.sub(r'[-\s]+', '-', name)
+        name = sanitize_track_name(path_parts[-1])
     else:
         name = parsed_url.netloc.replace('.', '-')
     
@@ -500,6 +648,9 @@ async def process_download(job_id: str, download_request: DownloadRequest):
             logger.info(f"[Job {job_id[:8]}] Generated name: {download_request.name}")
             await broadcast_job_update(job_id, job)
         
+        # Page fetched during detection, reused by the scraper
+        page_response = None
+        
         # Detect plugin if not specified
         if not download_request.plugin:
             job['status'] = 'detecting'
@@ -514,7 +665,7 @@ async def process_download(job_id: str, download_request: DownloadRequest):
             logger.info(f"[Job {job_id[:8]}] Analyzing page for audio players...")
             await broadcast_job_update(job_id, job)
             
-            detections = detect_plugin(download_request.url)
+            detections, page_response = detect_plugin(download_request.url)
             
             if not detections:
                 raise Exception("Could not detect any audio player on this page")
@@ -557,20 +708,17 @@ async def process_download(job_id: str, download_request: DownloadRequest):
         logger.info(f"[Job {job_id[:8]}] Extracting audio tracks from page...")
         await broadcast_job_update(job_id, job)
         
-        if download_request.plugin == 'simple' or download_request.plugin == 'simple_mp3':
-            module_name = 'scrapers.simple_audio_scraper'
-        elif download_request.plugin == 'plyr':
-            module_name = 'scrapers.scrape_plyr'
-        else:
-            raise Exception(f"Unknown plugin: {download_request.plugin}")
-        
         try:
-            scraper = importlib.import_module(module_name)
+            scrape = get_scraper(download_request.plugin)
         except ImportError as e:
-            raise Exception(f"Failed to import scraper module '{module_name}': {str(e)}")
+            raise Exception(f"Failed to import {download_request.plugin} scraper: {str(e)}")
         
         try:
-            tracks = scraper.scrape(str(download_request.url), download_request.name, download_request.name)
+            # Scrapers block on network I/O (and may run their own event loop)
+            tracks = await asyncio.to_thread(
+                scrape, str(download_request.url), download_request.name, download_request.name,
+                prefetched_response=page_response, max_workers=download_request.workers
+            )
         except Exception as e:
             raise Exception(f"Scraper error: {str(e)}")
         
@@ -591,14 +739,28 @@ async def process_download(job_id: str, download_request: DownloadRequest):
             job['message'] = f"Ready to stream {len(tracks)} tracks"
             job['stream_ready'] = True
             
+            # With a shared job store any worker may serve the stream and takes the
+            # job over from its snapshot, so hand it off instead of keeping a copy
+            # here that would stay 'streaming' after another worker finishes it
+            if job_store.is_enabled():
+                job['owner'] = job_owners.pop(job_id, None)
+                download_jobs.pop(job_id, None)
+                cancel_flags.pop(job_id, None)
+                await save_job_state(job_id, job)
+            
             # Send auto_download flag only to the connection that owns this job
-            owner_conn_id = job_owners.get(job_id)
+            owner_conn_id = job_owners.get(job_id, job.get('owner'))
             if owner_conn_id and owner_conn_id in active_connections:
                 # Send with auto_download flag to the owner
                 job_with_auto = job.copy()
                 job_with_auto['auto_download'] = True
                 await send_job_update(active_connections[owner_conn_id], job_id, job_with_auto)
                 logger.info(f"[Job {job_id[:8]}] Sent auto-download trigger to owner connection {owner_conn_id[:8]}")
+            elif job_store.is_enabled():
+                # The owner may be connected to another worker
+                job_with_auto = job.copy()
+                job_with_auto['auto_download'] = True
+                await broadcast_job_update(job_id, job_with_auto)
             else:
                 # No owner or owner disconnected, just send normal update
                 logger.warning(f"[Job {job_id[:8]}] No owner connection found for auto-download")
@@ -613,7 +775,7 @@ async def process_download(job_id: str, download_request: DownloadRequest):
             # Download tracks with async progress callback
             async def update_progress(completed, failed):
                 # Check if cancelled
-                if cancel_flags.get(job_id, False):
+                if await is_job_cancelled(job_id):
                     logger.info(f"[Job {job_id[:8]}] Download cancelled")
                     return False  # Signal to stop downloading
                 
@@ -628,19 +790,31 @@ async def process_download(job_id: str, download_request: DownloadRequest):
             # Import the async download function
             from downloader import download_tracks_async
             
-            result = await download_tracks_async(
-                tracks, 
-                download_request.name,
-                prefix=download_request.name if download_request.plugin in ['simple', 'simple_mp3'] else None,
-                max_workers=download_request.workers,
-                progress_callback=update_progress,
-                job_id=job_id
-            )
+            # Whatever this job writes makes a previously cached ZIP stale
+            dir_path = os.path.join('downloads', download_request.name)
+            await refresh_cached_zip(download_request.name, dir_path)
+            
+            successful = 0
+            try:
+                result = await download_tracks_async(
+                    tracks, 
+                    download_request.name,
+                    prefix=download_request.name if download_request.plugin in ['simple', 'simple_mp3'] else None,
+                    max_workers=download_request.workers,
+                    progress_callback=update_progress,
+                    job_id=job_id
+                )
+                successful = result['successful']
+            finally:
+                # Build the directory ZIP once so later downloads are served from disk,
+                # replacing any ZIP built on demand from partial contents meanwhile
+                try:
+                    await refresh_cached_zip(download_request.name, dir_path, rebuild=successful > 0)
+                except Exception as e:
+                    logger.warning(f"[Job {job_id[:8]}] Failed to build ZIP: {e}")
             
-            job['status'] = 'completed'
-            job['message'] = f"Downloaded {result['successful']} tracks successfully"
             job['result'] = result
-            job['completed_at'] = datetime.now()
+            finish_job(job, 'completed', f"Downloaded {result['successful']} tracks successfully")
             
             # Update database with completion info
             total_size = sum(result.get('file_sizes', {}).values())
@@ -653,7 +827,6 @@ async def process_download(job_id: str, download_request: DownloadRequest):
             
             # Track server-side completion
             if POSTHOG_API_KEY:
-                duration_seconds = (job['completed_at'] - job['created_at']).total_seconds()
                 posthog.capture(
                     distinct_id=job_owners.get(job_id, 'anonymous'),
                     event='server_download_completed',
@@ -663,7 +836,7 @@ async def process_download(job_id: str, download_request: DownloadRequest):
                         'tracks_count': result['successful'],
                         'failed_tracks': result['failed'],
                         'total_size_bytes': total_size,
-                        'duration_seconds': duration_seconds,
+                        'duration_seconds': job.get('duration_seconds'),
                         'download_mode': download_request.download_mode,
                         'workers': download_request.workers
                     }
@@ -674,9 +847,7 @@ async def process_download(job_id: str, download_request: DownloadRequest):
         
     except Exception as e:
         import traceback
-        job['status'] = 'error'
-        job['message'] = str(e)
-        job['completed_at'] = datetime.now()
+        finish_job(job, 'error', str(e))
         
         # Update database with error
         await update_download_status(
@@ -813,18 +984,21 @@ async def start_download(request: Request, download_request: DownloadRequest, ba
                 )
     
     # Create job entry
-    download_jobs[job_id] = {
+    created_at = datetime.now(timezone.utc)
+    register_job(job_id, {
         'job_id': job_id,
         'status': 'pending',
         'message': 'Job created',
         'progress': None,
         'result': None,
-        'created_at': datetime.now(),
+        'created_at': created_at,
+        '_created_at_iso': created_at.isoformat(),
+        '_start_mono': time.monotonic(),
         'completed_at': None,
         'request': download_request,
         'download_mode': download_request.download_mode,
         'download_name': download_request.name  # Set name immediately
-    }
+    })
     
     logger.info(f"[Job {job_id[:8]}] Created new download job in {download_request.download_mode} mode")
     
@@ -833,6 +1007,8 @@ async def start_download(request: Request, download_request: DownloadRequest, ba
         job_owners[job_id] = download_request.connection_id
         logger.info(f"[Job {job_id[:8]}] Assigned to connection {download_request.connection_id[:8]}")
     
+    await save_job_state(job_id, download_jobs[job_id])
+    
     # Log to database
     user_agent = request.headers.get("user-agent")
     client_ip = request.client.host if request.client else None
@@ -877,11 +1053,10 @@ async def start_download(request: Request, download_request: DownloadRequest, ba
 @app.get("/api/stream/{job_id}")
 async def stream_download(job_id: str):
     """Stream download directly to browser."""
-    if job_id not in download_jobs:
+    job = await get_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = download_jobs[job_id]
-    
     if job.get('download_mode') != 'browser':
         raise HTTPException(status_code=400, detail="This job is not in browser mode")
     
@@ -892,6 +1067,13 @@ async def stream_download(job_id: str):
     if not tracks:
         raise HTTPException(status_code=404, detail="No tracks found")
     
+    # This worker runs the stream from here on, so keep the job locally
+    if job_id not in download_jobs:
+        owner_conn_id = job.pop('owner', None)
+        if owner_conn_id:
+            job_owners[job_id] = owner_conn_id
+        register_job(job_id, job)
+    
     logger.info(f"[Job {job_id[:8]}] Starting streaming download for {len(tracks)} tracks")
     
     # Update job status
@@ -908,9 +1090,7 @@ async def stream_download(job_id: str):
                 yield chunk
             
             # Update completion status
-            job['status'] = 'completed'
-            job['message'] = "Download complete!"
-            job['completed_at'] = datetime.now()
+            finish_job(job, 'completed', "Download complete!")
             await broadcast_job_update(job_id, job)
             
             # Update database
@@ -923,9 +1103,7 @@ async def stream_download(job_id: str):
             )
             
         except Exception as e:
-            job['status'] = 'error'
-            job['message'] = f"Download failed: {str(e)}"
-            job['completed_at'] = datetime.now()
+            finish_job(job, 'error', f"Download failed: {str(e)}")
             await broadcast_job_update(job_id, job)
             logger.error(f"[Job {job_id[:8]}] Streaming error: {str(e)}")
             
@@ -954,10 +1132,11 @@ async def get_status(job_id: str):
     if not is_valid_job_id(job_id):
         raise HTTPException(status_code=400, detail="Invalid job ID format")
     
-    if job_id not in download_jobs:
+    job = await get_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    return DownloadStatus(**download_jobs[job_id])
+    return DownloadStatus(**job)
 
 @app.get("/api/jobs", response_model=List[DownloadStatus])
 async def list_jobs():
@@ -970,16 +1149,16 @@ async def delete_job(job_id: str):
     if not is_valid_job_id(job_id):
         raise HTTPException(status_code=400, detail="Invalid job ID format")
     
-    if job_id not in download_jobs:
+    job = await get_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = download_jobs[job_id]
-    if job['status'] in ['pending', 'detecting', 'downloading', 'streaming']:
+    if job['status'] in ACTIVE_JOB_STATUSES:
         raise HTTPException(status_code=400, detail="Cannot delete active job")
     
-    del download_jobs[job_id]
-    if job_id in cancel_flags:
-        del cancel_flags[job_id]
+    download_jobs.pop(job_id, None)
+    cancel_flags.pop(job_id, None)
+    await job_store.delete_job(job_id)
     
     logger.info(f"[Job {job_id[:8]}] Job deleted")
     return {"message": "Job cleared"}
@@ -990,18 +1169,17 @@ async def cancel_job(job_id: str):
     if not is_valid_job_id(job_id):
         raise HTTPException(status_code=400, detail="Invalid job ID format")
     
-    if job_id not in download_jobs:
+    job = await get_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = download_jobs[job_id]
-    if job['status'] not in ['pending', 'detecting', 'downloading', 'streaming']:
+    if job['status'] not in ACTIVE_JOB_STATUSES:
         raise HTTPException(status_code=400, detail="Job is not active")
     
     # Set cancel flag
     cancel_flags[job_id] = True
-    job['status'] = 'cancelled'
-    job['message'] = 'Download cancelled by user'
-    job['completed_at'] = datetime.now()
+    await job_store.set_cancel_flag(job_id)
+    finish_job(job, 'cancelled', 'Download cancelled by user')
     
     # Update database
     await update_download_status(
@@ -1047,16 +1225,23 @@ async def list_downloads(auth_token: Optional[str] = None):
         return []
     
     downloads = []
-    for dir_name in os.listdir(downloads_dir):
-        dir_path = os.path.join(downloads_dir, dir_name)
-        if os.path.isdir(dir_path):
-            audio_extensions = ('.mp3', '.m4a', '.aac', '.ogg', '.opus', '.webm', '.wav', '.flac')
-            files = [f for f in os.listdir(dir_path) if f.lower().endswith(audio_extensions)]
+    with os.scandir(downloads_dir) as dirs:
+        for dir_entry in dirs:
+            if not dir_entry.is_dir():
+                continue
+            # Count audio files and their total size in a single pass
+            file_count = 0
+            total_size = 0
+            with os.scandir(dir_entry.path) as entries:
+                for entry in entries:
+                    if is_audio_file(entry.name):
+                        file_count += 1
+                        total_size += entry.stat().st_size
             downloads.append({
-                'name': dir_name,
-                'files': len(files),
-                'size': sum(os.path.getsize(os.path.join(dir_path, f)) for f in files),
-                'created': datetime.fromtimestamp(os.path.getctime(dir_path))
+                'name': dir_entry.name,
+                'files': file_count,
+                'size': total_size,
+                'created': datetime.fromtimestamp(dir_entry.stat().st_ctime)
             })
     
     downloads.sort(key=lambda x: x['created'], reverse=True)
@@ -1081,6 +1266,7 @@ async def delete_download(name: str, auth_token: Optional[str] = None):
         raise HTTPException(status_code=404, detail="Download not found")
     
     shutil.rmtree(dir_path)
+    await refresh_cached_zip(name, dir_path)
     logger.info(f"Deleted download directory: {name}")
     return {"message": "Download deleted"}
 
@@ -1093,7 +1279,6 @@ async def download_as_zip(name: str, auth_token: Optional[str] = None):
             detail="Authentication required"
         )
     
-    logger.info(f"Creating ZIP for download: {name}")
     # Validate path to prevent directory traversal
     try:
         dir_path = validate_safe_path('downloads', name)
@@ -1103,27 +1288,18 @@ async def download_as_zip(name: str, auth_token: Optional[str] = None):
     if not os.path.exists(dir_path):
         raise HTTPException(status_code=404, detail="Download not found")
     
-    # Create ZIP file in memory
-    zip_buffer = BytesIO()
-    audio_extensions = ('.mp3', '.m4a', '.aac', '.ogg', '.opus', '.webm', '.wav', '.flac')
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        for file in os.listdir(dir_path):
-            if file.lower().endswith(audio_extensions):
-                file_path = os.path.join(dir_path, file)
-                zip_file.write(file_path, file)
-    
-    zip_buffer.seek(0)
-    zip_size = zip_buffer.getbuffer().nbytes
+    # Serve the cached ZIP, building it first if this directory has none yet
+    zip_path = f"{dir_path}.zip"
+    if not os.path.exists(zip_path):
+        async with zip_build_locks.setdefault(name, asyncio.Lock()):
+            if not os.path.exists(zip_path):
+                logger.info(f"Creating ZIP for download: {name}")
+                await asyncio.to_thread(build_zip, dir_path, zip_path)
     
-    logger.info(f"ZIP created for {name}, size: {zip_size} bytes")
-    
-    return StreamingResponse(
-        zip_buffer,
+    return FileResponse(
+        zip_path,
         media_type="application/zip",
-        headers={
-            "Content-Disposition": f"attachment; filename={name}.zip",
-            "Content-Length": str(zip_size)
-        }
+        filename=f"{name}.zip"
     )
 
 @app.get("/api/config")
@@ -1148,6 +1324,9 @@ async def startup_event():
     await init_db_pool()
     logger.info("Database pool initialized")
     
+    # Connect the shared job store used to run several workers
+    await job_store.init_job_store(deliver_job_update)
+    
     logger.info("=" * 60)
     logger.info("AudioFetch API v2.0 started successfully!")
     logger.info("Access the web interface at http://localhost:8000")
@@ -1171,6 +1350,8 @@ async def shutdown_event():
     """Close database pool and track shutdown."""
     await close_db_pool()
     logger.info("Database pool closed")
+    await job_store.close_job_store()
+    await close_shared_session()
     
     # Track server shutdown
     if POSTHOG_API_KEY:
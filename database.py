@@ -1,9 +1,10 @@
 """Database connection and logging functions."""
 import os
+import asyncio
 import asyncpg
 import logging
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from contextlib import asynccontextmanager
 
 logger = logging.getLogger(__name__)
@@ -11,9 +12,29 @@ logger = logging.getLogger(__name__)
 # Database connection pool
 _db_pool: Optional[asyncpg.Pool] = None
 
+# New download_logs rows are buffered and written in batches with COPY
+LOG_COLUMNS = (
+    'job_id', 'url', 'url_domain', 'custom_name', 'plugin', 'workers',
+    'download_mode', 'is_authenticated', 'connection_id',
+    'status', 'user_agent', 'ip_address', 'created_at'
+)
+# Row-by-row fallback for a batch COPY rejected because of one bad row
+LOG_INSERT_SQL = """
+    INSERT INTO download_logs (
+        job_id, url, url_domain, custom_name, plugin, workers,
+        download_mode, is_authenticated, connection_id,
+        status, user_agent, ip_address, created_at
+    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
+"""
+LOG_BATCH_SIZE = 100
+LOG_FLUSH_INTERVAL = 0.1  # seconds
+_pending_logs: List[tuple] = []
+_log_flush_lock: Optional[asyncio.Lock] = None
+_log_flusher_task: Optional[asyncio.Task] = None
+
 async def init_db_pool():
-    """Initialize the database connection pool."""
-    global _db_pool
+    """Initialize the database connection pool and start the log flusher."""
+    global _db_pool, _log_flush_lock, _log_flusher_task
     database_url = os.getenv("DATABASE_URL")
     
     if not database_url:
@@ -25,16 +46,36 @@ async def init_db_pool():
             database_url,
             min_size=1,
             max_size=10,
-            command_timeout=60
+            command_timeout=60,
+            # The hot queries below use fixed SQL text, so asyncpg's
+            # per-connection prepared statement cache keeps them parsed
+            statement_cache_size=1024,
+            max_cached_statement_lifetime=0
         )
         logger.info("Database connection pool initialized")
     except Exception as e:
         logger.error(f"Failed to initialize database pool: {e}")
         _db_pool = None
+        return
+    
+    if _log_flush_lock is None:
+        _log_flush_lock = asyncio.Lock()
+    if _log_flusher_task is None or _log_flusher_task.done():
+        _log_flusher_task = asyncio.create_task(_log_flusher())
 
 async def close_db_pool():
-    """Close the database connection pool."""
-    global _db_pool
+    """Flush pending logs and close the database connection pool."""
+    global _db_pool, _log_flusher_task
+    if _log_flusher_task:
+        _log_flusher_task.cancel()
+        # Let a flush already in progress unwind before the final one
+        try:
+            await _log_flusher_task
+        except asyncio.CancelledError:
+            pass
+        _log_flusher_task = None
+    await flush_download_logs()
+    
     if _db_pool:
         await _db_pool.close()
         _db_pool = None
@@ -54,6 +95,42 @@ async def get_db_connection():
         logger.error(f"Failed to acquire database connection: {e}")
         yield None
 
+async def _log_flusher():
+    """Periodically write buffered download_logs rows."""
+    while True:
+        await asyncio.sleep(LOG_FLUSH_INTERVAL)
+        await flush_download_logs()
+
+async def flush_download_logs():
+    """Write all buffered download_logs rows with a single COPY."""
+    if not _pending_logs or not _log_flush_lock:
+        return
+    
+    async with _log_flush_lock:
+        if not _pending_logs:
+            return
+        batch = _pending_logs[:]
+        _pending_logs.clear()
+        
+        async with get_db_connection() as conn:
+            if not conn:
+                return
+            
+            try:
+                await conn.copy_records_to_table(
+                    'download_logs', records=batch, columns=LOG_COLUMNS
+                )
+                return
+            except Exception as e:
+                logger.warning(f"Failed to log {len(batch)} download requests in one batch, inserting them one by one: {e}")
+            
+            # COPY is all-or-nothing, so only the rows that fail on their own are lost
+            for record in batch:
+                try:
+                    await conn.execute(LOG_INSERT_SQL, *record)
+                except Exception as e:
+                    logger.error(f"Failed to log download request {record[0]}: {e}")
+
 async def log_download_request(
     job_id: str,
     url: str,
@@ -67,25 +144,18 @@ async def log_download_request(
     user_agent: Optional[str],
     ip_address: Optional[str]
 ) -> bool:
-    """Log a new download request to the database."""
-    async with get_db_connection() as conn:
-        if not conn:
-            return False
-        
-        try:
-            await conn.execute("""
-                INSERT INTO download_logs (
-                    job_id, url, url_domain, custom_name, plugin, workers,
-                    download_mode, is_authenticated, connection_id,
-                    status, user_agent, ip_address, created_at
-                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
-            """, job_id, url, url_domain, custom_name, plugin, workers,
-                download_mode, is_authenticated, connection_id,
-                'pending', user_agent, ip_address, datetime.now(timezone.utc))
-            return True
-        except Exception as e:
-            logger.error(f"Failed to log download request: {e}")
-            return False
+    """Queue a new download request to be logged to the database."""
+    if not _db_pool:
+        return False
+    
+    _pending_logs.append((
+        job_id, url, url_domain, custom_name, plugin, workers,
+        download_mode, is_authenticated, connection_id,
+        'pending', user_agent, ip_address, datetime.now(timezone.utc)
+    ))
+    if len(_pending_logs) >= LOG_BATCH_SIZE:
+        await flush_download_logs()
+    return True
 
 async def update_download_status(
     job_id: str,
@@ -95,35 +165,27 @@ async def update_download_status(
     total_size_bytes: Optional[int] = None
 ) -> bool:
     """Update the status of a download job."""
+    # Make sure the job's row has been written before updating it
+    await flush_download_logs()
+    
     async with get_db_connection() as conn:
         if not conn:
             return False
         
         try:
-            completed_at = datetime.now(timezone.utc) if status in ['completed', 'error', 'cancelled'] else None
-            
-            # Calculate duration if completed
-            duration_seconds = None
-            if completed_at:
-                result = await conn.fetchrow(
-                    "SELECT created_at FROM download_logs WHERE job_id = $1",
-                    job_id
-                )
-                if result and result['created_at']:
-                    duration = completed_at - result['created_at']
-                    duration_seconds = duration.total_seconds()
-            
+            # Terminal states get completion time and duration computed server-side
             await conn.execute("""
                 UPDATE download_logs
                 SET status = $2,
                     error_message = $3,
                     tracks_count = $4,
                     total_size_bytes = $5,
-                    completed_at = $6,
-                    duration_seconds = $7
+                    completed_at = CASE WHEN $2 IN ('completed', 'error', 'cancelled')
+                        THEN now() END,
+                    duration_seconds = CASE WHEN $2 IN ('completed', 'error', 'cancelled')
+                        THEN EXTRACT(EPOCH FROM (now() - created_at)) END
                 WHERE job_id = $1
-            """, job_id, status, error_message, tracks_count,
-                total_size_bytes, completed_at, duration_seconds)
+            """, job_id, status, error_message, tracks_count, total_size_bytes)
             return True
         except Exception as e:
             logger.error(f"Failed to update download status: {e}")
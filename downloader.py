@@ -6,18 +6,150 @@ import os
 import re
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 import sys
-from collections import OrderedDict
+import logging
 import asyncio
 import aiohttp
 from typing import List, Dict, Optional, Callable
 
+logger = logging.getLogger(__name__)
+
+# Whether stdout is an interactive terminal (False in Docker or when piped)
+_IS_TTY = sys.stdout.isatty()
+
+# Shared HTTP session so downloads from the same host reuse connections
+HTTP_POOL_SIZE = 32
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    # Audio is already compressed, so ask for the body as-is
+    'Accept-Encoding': 'identity'
+})
+_adapter = HTTPAdapter(
+    pool_connections=HTTP_POOL_SIZE,
+    pool_maxsize=HTTP_POOL_SIZE,
+    # Retry transient gateway errors before a track is marked failed
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+)
+_SESSION.mount('http://', _adapter)
+_SESSION.mount('https://', _adapter)
+
+# Filename sanitization patterns, compiled once at import
+_RE_BAD = re.compile(r'[^\w\s-]')
+_RE_DASH = re.compile(r'[-\s]+')
+# ASCII characters _RE_BAD would strip, deleted in a single str.translate pass
+_TABLE = str.maketrans('', '', ''.join(c for c in map(chr, range(128)) if _RE_BAD.match(c)))
+
+
+# Bars for finished and failed tracks
+_FULL_BAR = '█' * 30
+_ERR_BAR = '✗' * 30
+# Every possible 30-wide progress bar, indexed by filled width
+_BARS = ['█' * i + '░' * (30 - i) for i in range(31)]
+
+
+# Read size for the per-thread buffer the threaded paths read response bodies into
+COPY_BUFFER_SIZE = 256 * 1024
+# Bytes the async path collects before handing a write to a worker thread
+WRITE_BATCH_SIZE = 1024 * 1024
+_thread_local = threading.local()
+
+
+def preallocate(fd, size):
+    """Reserve size bytes for a file up front so it is laid out in one extent."""
+    # posix_fallocate is Linux/BSD only; elsewhere the file simply grows as written
+    if size <= 0 or not hasattr(os, 'posix_fallocate'):
+        return
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except OSError:
+        # Not every filesystem supports preallocation
+        pass
+
+
+# Downloads are written under this suffix and renamed once complete,
+# so an interrupted download can be resumed from where it stopped. Part
+# files are never preallocated: their size must be the bytes received.
+PART_SUFFIX = '.part'
+# Segmented downloads fill their file out of order, so they use a suffix
+# that is never resumed from
+SEGMENTS_SUFFIX = '.segments'
+
+
+def file_size(path):
+    """Get the size of a file, or 0 if it doesn't exist."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def remove_if_exists(path):
+    """Delete a file, ignoring one that is already gone."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def matches_remote_size(headers, size):
+    """Check a HEAD reply's Content-Length against the size of an existing file."""
+    return headers.get('Content-Length') == str(size)
+
+
+def resume_headers(offset):
+    """Request headers asking for the rest of a body from offset onwards."""
+    return {'Range': f'bytes={offset}-'} if offset else None
+
+
+def is_already_complete(status, headers, offset):
+    """Check whether a 416 reply to a resume means the partial file holds the whole body."""
+    return status == 416 and headers.get('Content-Range') == f'bytes */{offset}'
+
+
+def stream_to_file(response, filename, offset=0):
+    """
+    Write a streamed requests response to filename starting at offset,
+    yielding the file size so far.
+    """
+    buffer = getattr(_thread_local, 'buffer', None)
+    if buffer is None:
+        buffer = _thread_local.buffer = memoryview(bytearray(COPY_BUFFER_SIZE))
+    
+    response.raw.decode_content = True
+    fd = os.open(filename, os.O_WRONLY | os.O_CREAT | (0 if offset else os.O_TRUNC), 0o644)
+    try:
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        os.lseek(fd, offset, os.SEEK_SET)
+        
+        written = offset
+        while True:
+            n = response.raw.readinto(buffer)
+            if not n:
+                break
+            view = buffer[:n]
+            while view:
+                view = view[os.write(fd, view):]
+            written += n
+            yield written
+        
+        # Finished files are not read back, so let the kernel drop them from cache
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
 
 def format_progress_bar(percent, width=30):
     """Create a progress bar string."""
     filled = int(width * percent / 100)
+    if width == 30:
+        return _BARS[min(30, max(0, filled))]
     bar = '█' * filled + '░' * (width - filled)
     return bar
 
@@ -33,148 +165,179 @@ def format_size(bytes):
 
 def sanitize_filename(filename):
     """Clean filename for safe file system usage."""
-    # Remove invalid characters
-    safe_name = re.sub(r'[^\w\s-]', '', filename)
+    # Remove invalid characters (translate is equivalent for pure ASCII)
+    if filename.isascii():
+        safe_name = filename.translate(_TABLE)
+    else:
+        safe_name = _RE_BAD.sub('', filename)
     # Replace spaces and multiple dashes with single dash
-    safe_name = re.sub(r'[-\s]+', '-', safe_name)
-    return safe_name
+    return _RE_DASH.sub('-', safe_name)
+
+
+# Guards progress state shared between download threads and the renderer
+_PRINT_LOCK = threading.Lock()
 
 
 class MultiLineProgress:
     """Manages multiple progress lines for parallel downloads."""
+    # Seconds between redraws by the renderer thread
+    RENDER_INTERVAL = 0.1
+    
     def __init__(self, total_tracks):
-        self.lock = threading.Lock()
         self.total_tracks = total_tracks
-        self.lines = OrderedDict()
         self.completed_count = 0
         self.failed_count = 0
         
-        # Reserve space for all tracks
-        for i in range(1, total_tracks + 1):
-            print()  # Create empty lines
+        # Latest state per track, and the tracks changed since the last redraw
+        self._state = {}
+        self._dirty = set()
+        self._heads = {}
+        
+        # Reserve space for all tracks with one write
+        sys.stdout.write('\n' * total_tracks)
+        if _IS_TTY:
+            sys.stdout.flush()
+        
+        # Redraw from a single thread so download threads never touch stdout
+        self._stop = threading.Event()
+        self._renderer = threading.Thread(target=self._render_loop, daemon=True)
+        self._renderer.start()
     
     def update_line(self, track_num, filename, status, percent=0, downloaded=0, total=0):
-        """Update a specific line with progress information."""
-        with self.lock:
-            # Calculate how many lines up to go
-            lines_up = self.total_tracks - track_num + 1
-            
-            # Build the status line
-            if status == 'downloading':
-                if total > 0:
-                    bar = format_progress_bar(percent)
-                    line = f"[{track_num:2d}/{self.total_tracks:2d}] {filename:<40} [{bar}] {percent:5.1f}% {format_size(downloaded)}/{format_size(total)}"
-                else:
-                    line = f"[{track_num:2d}/{self.total_tracks:2d}] {filename:<40} [{'?' * 30}] Downloading..."
-            elif status == 'complete':
+        """Record progress for a track; the renderer thread draws it."""
+        with _PRINT_LOCK:
+            if status == 'complete':
                 self.completed_count += 1
-                line = f"[{track_num:2d}/{self.total_tracks:2d}] {filename:<40} [{'█' * 30}] 100.0% ✓ Complete ({format_size(total)})"
             elif status == 'error':
                 self.failed_count += 1
-                line = f"[{track_num:2d}/{self.total_tracks:2d}] {filename:<40} [{'✗' * 30}] ✗ Error"
-            else:
-                line = f"[{track_num:2d}/{self.total_tracks:2d}] {filename:<40} Waiting..."
-            
-            # Clear the line and print the new content
-            sys.stdout.write(f"\033[{lines_up}A")  # Move up
-            sys.stdout.write(f"\r{line:<120}")     # Write line (padded to clear old content)
-            sys.stdout.write(f"\033[{lines_up}B")  # Move back down
-            sys.stdout.flush()
-
-
-def download_file_with_progress(url, filename, track_info, progress_mgr=None):
-    """Download a file with progress tracking."""
-    name = os.path.basename(filename)
-    track_num = track_info['num']
-    total_tracks = track_info['total']
+            self._state[track_num] = (filename, status, percent, downloaded, total)
+            self._dirty.add(track_num)
     
-    # For single file download or when no progress manager
-    if progress_mgr is None:
-        return download_file_simple(url, filename, track_info)
+    def close(self):
+        """Stop the renderer thread and draw the final state."""
+        self._stop.set()
+        self._renderer.join()
+        self._render()
     
-    # Multi-line progress mode
-    progress_mgr.update_line(track_num, name, 'downloading')
+    def _render_loop(self):
+        while not self._stop.wait(self.RENDER_INTERVAL):
+            self._render()
     
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, stream=True, headers=headers, timeout=120)
-        response.raise_for_status()
+    def _format_line(self, track_num, filename, status, percent, downloaded, total):
+        """Build the status line for a track."""
+        # The track number and name never change, so format them only once
+        head = self._heads.get(track_num)
+        if head is None:
+            head = self._heads[track_num] = f"[{track_num:2d}/{self.total_tracks:2d}] {filename:<40} "
         
-        total_size = int(response.headers.get('content-length', 0))
-        downloaded = 0
-        last_update = time.time()
+        if status == 'downloading':
+            if total > 0:
+                bar = format_progress_bar(percent)
+                return f"{head}[{bar}] {percent:5.1f}% {format_size(downloaded)}/{format_size(total)}"
+            return f"{head}[{'?' * 30}] Downloading..."
+        elif status == 'complete':
+            return f"{head}[{_FULL_BAR}] 100.0% ✓ Complete ({format_size(total)})"
+        elif status == 'error':
+            return f"{head}[{_ERR_BAR}] ✗ Error"
+        return f"{head}Waiting..."
+    
+    def _render(self):
+        """Redraw every line that changed since the last render in one write."""
+        with _PRINT_LOCK:
+            if not self._dirty:
+                return
+            changed = [(track_num, self._state[track_num]) for track_num in sorted(self._dirty)]
+            self._dirty.clear()
         
-        with open(filename, 'wb') as fd:
-            for chunk in response.iter_content(chunk_size=32768):
-                fd.write(chunk)
-                downloaded += len(chunk)
-                
-                # Update progress every 0.1 seconds
-                current_time = time.time()
-                if current_time - last_update > 0.1 or downloaded == total_size:
-                    if total_size > 0:
-                        percent = (downloaded / total_size) * 100
-                        progress_mgr.update_line(track_num, name, 'downloading', percent, downloaded, total_size)
-                        last_update = current_time
+        # Save the cursor (DECSC), then for each line restore it (DECRC), move up and rewrite
+        parts = ["\0337"]
+        for track_num, state in changed:
+            lines_up = self.total_tracks - track_num + 1
+            line = self._format_line(track_num, *state)
+            parts.append(f"\0338\033[{lines_up}A\r{line:<120}")
+        parts.append("\0338")
         
-        progress_mgr.update_line(track_num, name, 'complete', 100, total_size, total_size)
-        return True, total_size
-    except Exception as e:
-        progress_mgr.update_line(track_num, name, 'error')
-        return False, 0
+        sys.stdout.write(''.join(parts))
+        if _IS_TTY:
+            sys.stdout.flush()
 
 
-def download_file_docker(url, filename, track_num):
-    """Download file in Docker environment without fancy progress."""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, stream=True, headers=headers, timeout=120)
+def fetch_to_file(url, filename, on_progress=None, interval=0.1):
+    """
+    Download url to filename with the shared session, resuming a partial
+    download left by an earlier attempt and skipping a finished one.
+    
+    on_progress(downloaded, total_size) is called at most once per interval
+    seconds while the body is written, when the size is known.
+    
+    Returns:
+        The size of the file (0 if unknown)
+    """
+    # A finished file from an earlier run is kept when its size still matches
+    existing = file_size(filename)
+    if existing:
+        try:
+            with _SESSION.head(url, allow_redirects=True, timeout=30) as head:
+                if head.ok and matches_remote_size(head.headers, existing):
+                    return existing
+        except requests.RequestException as e:
+            # Without a usable HEAD the file is simply downloaded again
+            logger.debug("HEAD for %s failed (%s), downloading it again", url, e)
+    
+    part_path = f"{filename}{PART_SUFFIX}"
+    offset = file_size(part_path)
+    
+    with _SESSION.get(url, stream=True, timeout=120, headers=resume_headers(offset)) as response:
+        if offset and response.status_code == 416:
+            if not is_already_complete(response.status_code, response.headers, offset):
+                # The partial file doesn't match the current body, so start over
+                os.remove(part_path)
+                return fetch_to_file(url, filename, on_progress, interval)
+            os.replace(part_path, filename)
+            return offset
         response.raise_for_status()
         
-        total_size = int(response.headers.get('content-length', 0))
+        # A server that ignores the range sends the whole body again
+        if response.status_code != 206:
+            offset = 0
         
-        with open(filename, 'wb') as fd:
-            for chunk in response.iter_content(chunk_size=32768):
-                fd.write(chunk)
+        content_length = int(response.headers.get('content-length', 0))
+        total_size = offset + content_length if content_length else 0
+        last_update = time.monotonic()
         
-        return True, total_size, track_num
-    except Exception as e:
-        print(f"[ERROR] Track {track_num}: {str(e)}")
-        return False, 0, track_num
+        for downloaded in stream_to_file(response, part_path, offset):
+            if on_progress is not None and total_size > 0:
+                now = time.monotonic()
+                if now - last_update >= interval:
+                    last_update = now
+                    on_progress(downloaded, total_size)
+    
+    os.replace(part_path, filename)
+    return total_size
 
 
-def download_file_docker(url, filename, track_info):
-    """Docker-friendly download without ANSI escape sequences."""
+def download_file_with_progress(url, filename, track_info, progress_mgr=None):
+    """Download a file with progress tracking."""
     name = os.path.basename(filename)
     track_num = track_info['num']
-    total_tracks = track_info['total']
     
-    print(f"[{track_num}/{total_tracks}] Downloading {name}...")
-    sys.stdout.flush()
+    # For single file download or when no progress manager
+    if progress_mgr is None:
+        return download_file_simple(url, filename, track_info)
+    
+    # Multi-line progress mode
+    progress_mgr.update_line(track_num, name, 'downloading')
+    
+    def update_progress(downloaded, total_size):
+        percent = (downloaded / total_size) * 100
+        progress_mgr.update_line(track_num, name, 'downloading', percent, downloaded, total_size)
     
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, stream=True, headers=headers, timeout=120)
-        response.raise_for_status()
-        
-        total_size = int(response.headers.get('content-length', 0))
-        
-        with open(filename, 'wb') as fd:
-            for chunk in response.iter_content(chunk_size=32768):
-                fd.write(chunk)
-        
-        print(f"[{track_num}/{total_tracks}] ✓ {name} ({format_size(total_size)})")
-        sys.stdout.flush()
+        total_size = fetch_to_file(url, filename, update_progress)
+        progress_mgr.update_line(track_num, name, 'complete', 100, total_size, total_size)
         return True, total_size
     except Exception as e:
-        print(f"[{track_num}/{total_tracks}] ✗ {name} - Error: {str(e)}")
-        sys.stdout.flush()
+        progress_mgr.update_line(track_num, name, 'error')
         return False, 0
 
 
@@ -183,41 +346,46 @@ def download_file_simple(url, filename, track_info):
     name = os.path.basename(filename)
     track_num = track_info['num']
     total_tracks = track_info['total']
+    start_time = time.monotonic()
+    
+    def log_progress(downloaded, total_size):
+        logger.info("[%d/%d] %s %.1f%% %s/%s @ %s/s",
+                    track_num, total_tracks, name,
+                    downloaded / total_size * 100,
+                    format_size(downloaded), format_size(total_size),
+                    format_size(downloaded / (time.monotonic() - start_time)))
     
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, stream=True, headers=headers, timeout=120)
-        response.raise_for_status()
-        
-        total_size = int(response.headers.get('content-length', 0))
-        downloaded = 0
-        start_time = time.time()
-        
-        with open(filename, 'wb') as fd:
-            for chunk in response.iter_content(chunk_size=16384):
-                fd.write(chunk)
-                downloaded += len(chunk)
-                
-                # Update progress every 100KB or at completion
-                if downloaded % (100 * 1024) < 16384 or downloaded == total_size:
-                    if total_size > 0:
-                        percent = (downloaded / total_size) * 100
-                        elapsed = time.time() - start_time
-                        speed = downloaded / elapsed if elapsed > 0 else 0
-                        
-                        bar = format_progress_bar(percent)
-                        line = f"\r[{track_num:2d}/{total_tracks:2d}] {name:<40} [{bar}] {percent:5.1f}% {format_size(downloaded)}/{format_size(total_size)} @ {format_size(speed)}/s"
-                        print(line, end='', flush=True)
-        
-        print(f"\r[{track_num:2d}/{total_tracks:2d}] {name:<40} [{'█' * 30}] 100.0% ✓ Complete ({format_size(total_size)})              ")
+        # Log progress at most once per second
+        total_size = fetch_to_file(url, filename, log_progress, interval=1.0)
+        logger.info("[%d/%d] ✓ %s (%s)", track_num, total_tracks, name, format_size(total_size))
         return True, total_size
     except Exception as e:
-        print(f"\r[{track_num:2d}/{total_tracks:2d}] {name:<40} [{'✗' * 30}] ✗ Error: {str(e)[:30]}...")
+        logger.error("[%d/%d] ✗ %s - Error: %s", track_num, total_tracks, name, e)
         return False, 0
 
 
+def track_filename(track, prefix=None):
+    """Choose the output filename for a track."""
+    if track.get('original_filename'):
+        # Use original filename if provided by scraper
+        return track['original_filename']
+    if prefix and track.get('track_num'):
+        # For simple scrapers that need numbering
+        return f"{prefix}_{track['track_num']:03d}.mp3"
+    # For scrapers that provide track names
+    return f"{sanitize_filename(track['name'])}.mp3"
+
+
+def build_download_tasks(tracks, downloads_dir, prefix=None):
+    """Build the (url, filepath, track_info) tuple for each track."""
+    total = len(tracks)
+    return [
+        (track['url'], os.path.join(downloads_dir, track_filename(track, prefix)), {'num': i, 'total': total})
+        for i, track in enumerate(tracks, 1)
+    ]
+
+
 def download_tracks(tracks, directory, prefix=None, max_workers=5, progress_callback=None, job_id=None):
     """
     Download all tracks with consistent progress display.
@@ -233,78 +401,44 @@ def download_tracks(tracks, directory, prefix=None, max_workers=5, progress_call
     Returns:
         Dictionary with download statistics
     """
+    # Detect if running in Docker (no TTY)
+    if not _IS_TTY:
+        # Docker mode - download on a single event loop without ANSI escape sequences
+        async def async_progress_callback(successful, failed):
+            if progress_callback:
+                progress_callback(successful, failed)
+            return True
+        
+        async def run_downloads():
+            try:
+                return await download_tracks_async(
+                    tracks, directory, prefix, max_workers, async_progress_callback, job_id
+                )
+            finally:
+                await close_shared_session()
+        
+        return asyncio.run(run_downloads())
+    
     # Create downloads directory structure
     downloads_dir = os.path.join('downloads', directory)
-    if not os.path.exists(downloads_dir):
-        os.makedirs(downloads_dir)
+    os.makedirs(downloads_dir, exist_ok=True)
     
-    # Detect if running in Docker (no TTY)
-    is_docker = not sys.stdout.isatty()
+    job_prefix = f"[Job {job_id[:8]}] " if job_id else ""
+    print(f"\n{job_prefix}Downloading to: downloads/{directory}/")
+    print(f"{job_prefix}Total tracks to download: {len(tracks)}")
     
-    if not is_docker:
-        job_prefix = f"[Job {job_id[:8]}] " if job_id else ""
-        print(f"\n{job_prefix}Downloading to: downloads/{directory}/")
-        print(f"{job_prefix}Total tracks to download: {len(tracks)}")
-        
-        if max_workers > 1:
-            print(f"{job_prefix}Parallel downloads: {max_workers}")
-        print("-" * 80)
+    if max_workers > 1:
+        print(f"{job_prefix}Parallel downloads: {max_workers}")
+    print("-" * 80)
     
     successful = 0
     failed = 0
     
     # Prepare download tasks
-    download_tasks = []
-    for i, track in enumerate(tracks, 1):
-        # Generate filename
-        if track.get('original_filename'):
-            # Use original filename if provided by scraper
-            filename = track['original_filename']
-        elif prefix and track.get('track_num'):
-            # For simple scrapers that need numbering
-            filename = f"{prefix}_{track['track_num']:03d}.mp3"
-        else:
-            # For scrapers that provide track names
-            safe_name = sanitize_filename(track['name'])
-            filename = f"{safe_name}.mp3"
-        
-        filepath = os.path.join(downloads_dir, filename)
-        
-        track_info = {
-            'num': i,
-            'total': len(tracks)
-        }
-        
-        download_tasks.append((track['url'], filepath, track_info))
+    download_tasks = build_download_tasks(tracks, downloads_dir, prefix)
     
     # Execute downloads
-    if is_docker:
-        # Docker mode - simple progress without ANSI escape sequences
-        job_prefix = f"[Job {job_id[:8]}] " if job_id else ""
-        print(f"{job_prefix}Starting download of {len(tracks)} tracks...")
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_task = {
-                executor.submit(download_file_docker, url, filepath, track_info): (url, filepath, track_info)
-                for url, filepath, track_info in download_tasks
-            }
-            
-            for future in as_completed(future_to_task):
-                try:
-                    success, size = future.result()
-                    if success:
-                        successful += 1
-                    else:
-                        failed += 1
-                    if progress_callback:
-                        progress_callback(successful, failed)
-                        
-                except Exception as e:
-                    failed += 1
-                    print(f"[ERROR] Unexpected error: {e}")
-                    if progress_callback:
-                        progress_callback(successful, failed)
-                        
-    elif max_workers == 1:
+    if max_workers == 1:
         # Sequential downloads with inline progress
         for url, filepath, track_info in download_tasks:
             success, size = download_file_simple(url, filepath, track_info)
@@ -345,16 +479,15 @@ def download_tracks(tracks, directory, prefix=None, max_workers=5, progress_call
                     if progress_callback:
                         progress_callback(successful, failed)
         
-        # Move cursor to bottom after all lines
+        # Draw the final state, then move cursor to bottom after all lines
+        progress_mgr.close()
         print()
     
-    if not is_docker:
-        print("-" * 80)
-        job_prefix = f"[Job {job_id[:8]}] " if job_id else ""
-        print(f"\n{job_prefix}Download Summary:")
-        print(f"  ✓ Successful: {successful}")
-        print(f"  ✗ Failed: {failed}")
-        print(f"  Total: {len(tracks)}")
+    print("-" * 80)
+    print(f"\n{job_prefix}Download Summary:")
+    print(f"  ✓ Successful: {successful}")
+    print(f"  ✗ Failed: {failed}")
+    print(f"  Total: {len(tracks)}")
     
     return {
         'successful': successful,
@@ -363,7 +496,243 @@ def download_tracks(tracks, directory, prefix=None, max_workers=5, progress_call
     }
 
 
-async def download_file_async(session: aiohttp.ClientSession, url: str, filepath: str, track_info: dict, job_id: str = None) -> tuple:
+# Files at least this large are downloaded as parallel byte-range segments
+SEGMENTED_MIN_SIZE = 5 * 1024 * 1024
+# Most segments per file, each on its own connection from the job's worker limit
+SEGMENT_COUNT = 4
+
+# Session shared by every download_tracks_async call, and the loop it belongs to
+SHARED_CONNECTION_LIMIT = 100
+_shared_session: Optional[aiohttp.ClientSession] = None
+_shared_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_shared_session() -> aiohttp.ClientSession:
+    """Return the shared aiohttp session, creating it for the running loop if needed."""
+    global _shared_session, _shared_session_loop
+    loop = asyncio.get_running_loop()
+    
+    # A session can't be used outside the loop it was created on (e.g. after asyncio.run)
+    if _shared_session is None or _shared_session.closed or _shared_session_loop is not loop:
+        connector = aiohttp.TCPConnector(
+            limit=SHARED_CONNECTION_LIMIT,
+            ttl_dns_cache=600,
+            use_dns_cache=True,
+            force_close=False,
+            keepalive_timeout=60
+        )
+        _shared_session = aiohttp.ClientSession(connector=connector, headers={'Accept-Encoding': 'identity'})
+        _shared_session_loop = loop
+    return _shared_session
+
+
+async def close_shared_session():
+    """Close the shared aiohttp session, if one is open."""
+    global _shared_session, _shared_session_loop
+    if _shared_session is not None and not _shared_session.closed:
+        await _shared_session.close()
+    _shared_session = None
+    _shared_session_loop = None
+
+
+async def write_response_async(response: aiohttp.ClientResponse, filepath: str, offset: int = 0) -> int:
+    """Write an aiohttp response body to filepath starting at offset, returning the file size."""
+    downloaded = offset
+    
+    # Disk I/O runs in worker threads so slow writes don't stall the event loop
+    with await asyncio.to_thread(open, filepath, 'r+b' if offset else 'wb') as fd:
+        fd.seek(offset)
+        # Coalesce chunks so each thread hop writes WRITE_BATCH_SIZE bytes
+        pending = bytearray()
+        async for chunk in response.content.iter_any():
+            pending += chunk
+            downloaded += len(chunk)
+            if len(pending) >= WRITE_BATCH_SIZE:
+                batch, pending = pending, bytearray()
+                await asyncio.to_thread(fd.write, batch)
+        if pending:
+            await asyncio.to_thread(fd.write, pending)
+    
+    return downloaded
+
+
+def pwrite_all(fd: int, data: bytearray, offset: int):
+    """Write all of data to fd at offset."""
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+async def download_segment(session: aiohttp.ClientSession, url: str, fd: int, start: int, end: int):
+    """Download bytes start..end (inclusive) of url into the same range of fd."""
+    async with session.get(url, headers={'Range': f'bytes={start}-{end}'}) as response:
+        response.raise_for_status()
+        if response.status != 206:
+            raise ValueError(f"Server ignored range request (status {response.status})")
+        
+        offset = start
+        pending = bytearray()
+        async for chunk in response.content.iter_any():
+            pending += chunk
+            if len(pending) >= WRITE_BATCH_SIZE:
+                batch, pending = pending, bytearray()
+                await asyncio.to_thread(pwrite_all, fd, batch, offset)
+                offset += len(batch)
+        if pending:
+            await asyncio.to_thread(pwrite_all, fd, pending, offset)
+            offset += len(pending)
+        
+        if offset != end + 1:
+            raise ValueError(f"Segment {start}-{end} ended after {offset - start} bytes")
+
+
+async def download_segmented(session: aiohttp.ClientSession, url: str, filepath: str, total_size: int, segment_count: int):
+    """Download url in segment_count parallel byte ranges."""
+    fd = await asyncio.to_thread(os.open, filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        await asyncio.to_thread(preallocate, fd, total_size)
+        
+        segment_size = -(-total_size // segment_count)
+        tasks = [
+            asyncio.create_task(download_segment(session, url, fd, start, min(start + segment_size, total_size) - 1))
+            for start in range(0, total_size, segment_size)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Stop the other segments before their file descriptor is closed
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+    finally:
+        os.close(fd)
+
+
+async def claim_free_slots(limiter: Optional[asyncio.Semaphore], wanted: int) -> int:
+    """
+    Take up to wanted slots from limiter without waiting for any, returning
+    how many were taken. A limiter of None places no limit.
+    """
+    if limiter is None:
+        return wanted
+    claimed = 0
+    # acquire() doesn't suspend while the semaphore isn't locked
+    while claimed < wanted and not limiter.locked():
+        await limiter.acquire()
+        claimed += 1
+    return claimed
+
+
+def release_slots(limiter: Optional[asyncio.Semaphore], count: int):
+    """Give back slots taken with claim_free_slots."""
+    if limiter is not None:
+        for _ in range(count):
+            limiter.release()
+
+
+async def probe_segmentable(session: aiohttp.ClientSession, url: str) -> int:
+    """
+    Check with a HEAD request whether url is worth fetching in segments,
+    returning its size if so and 0 otherwise (including when the HEAD fails,
+    so the file is fetched as a single stream).
+    """
+    try:
+        async with session.head(url, allow_redirects=True) as head:
+            if not head.ok or head.headers.get('Accept-Ranges', '').lower() != 'bytes':
+                return 0
+            size = int(head.headers.get('Content-Length', 0))
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return 0
+    return size if size >= SEGMENTED_MIN_SIZE else 0
+
+
+async def fetch_segmented(session: aiohttp.ClientSession, url: str, filepath: str, total_size: int,
+                          segment_count: int, log_prefix: str = "") -> int:
+    """Download url to filepath in parallel segments, falling back to a single stream."""
+    part_path = f"{filepath}{PART_SUFFIX}"
+    segments_path = f"{filepath}{SEGMENTS_SUFFIX}"
+    try:
+        await download_segmented(session, url, segments_path, total_size, segment_count)
+        # An empty partial file from an earlier attempt is superseded
+        await asyncio.to_thread(remove_if_exists, part_path)
+        part_path = segments_path
+    except Exception as e:
+        # The segments are not contiguous, so nothing here can be resumed
+        await asyncio.to_thread(remove_if_exists, segments_path)
+        logger.warning("%sSegmented download of %s failed (%s), retrying as a single stream",
+                       log_prefix, os.path.basename(filepath), e)
+        async with session.get(url) as response:
+            response.raise_for_status()
+            await write_response_async(response, part_path)
+    except asyncio.CancelledError:
+        remove_if_exists(segments_path)
+        raise
+    
+    await asyncio.to_thread(os.replace, part_path, filepath)
+    return total_size
+
+
+async def fetch_to_file_async(session: aiohttp.ClientSession, url: str, filepath: str, log_prefix: str = "",
+                              limiter: Optional[asyncio.Semaphore] = None) -> int:
+    """
+    Download url to filepath, resuming a partial download left by an earlier
+    attempt and skipping a finished one. Returns the size of the file (0 if unknown).
+    
+    The caller is expected to hold one limiter slot for this download. Large
+    files use extra parallel segments only for slots that are free right now.
+    """
+    # A finished file from an earlier run is kept when its size still matches
+    existing = await asyncio.to_thread(file_size, filepath)
+    if existing:
+        try:
+            async with session.head(url, allow_redirects=True) as head:
+                if head.ok and matches_remote_size(head.headers, existing):
+                    return existing
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # Without a usable HEAD the file is simply downloaded again
+            logger.debug("%sHEAD for %s failed (%s), downloading it again", log_prefix, url, e)
+    
+    part_path = f"{filepath}{PART_SUFFIX}"
+    offset = await asyncio.to_thread(file_size, part_path)
+    
+    # Large files from servers that accept ranges are fetched in parallel segments
+    if not offset and hasattr(os, 'pwrite'):
+        extra = await claim_free_slots(limiter, SEGMENT_COUNT - 1)
+        try:
+            total_size = await probe_segmentable(session, url) if extra else 0
+            if total_size:
+                return await fetch_segmented(session, url, filepath, total_size, extra + 1, log_prefix)
+        finally:
+            release_slots(limiter, extra)
+    
+    async with session.get(url, headers=resume_headers(offset)) as response:
+        if offset and response.status == 416:
+            if not is_already_complete(response.status, response.headers, offset):
+                # The partial file doesn't match the current body, so start over
+                response.close()
+                await asyncio.to_thread(os.remove, part_path)
+                return await fetch_to_file_async(session, url, filepath, log_prefix, limiter)
+            await asyncio.to_thread(os.replace, part_path, filepath)
+            return offset
+        response.raise_for_status()
+        
+        # A server that ignores the range sends the whole body again
+        if response.status != 206:
+            offset = 0
+        
+        content_length = int(response.headers.get('content-length', 0))
+        total_size = offset + content_length if content_length else 0
+        await write_response_async(response, part_path, offset)
+    
+    await asyncio.to_thread(os.replace, part_path, filepath)
+    return total_size
+
+
+async def download_file_async(session: aiohttp.ClientSession, url: str, filepath: str, track_info: dict, job_id: str = None,
+                              limiter: Optional[asyncio.Semaphore] = None) -> tuple:
     """Download a single file asynchronously."""
     try:
         job_prefix = f"[Job {job_id[:8]}] " if job_id else ""
@@ -373,20 +742,13 @@ async def download_file_async(session: aiohttp.ClientSession, url: str, filepath
         
         print(f"{job_prefix}[{track_num}/{total_tracks}] Downloading {name}...")
         
-        async with session.get(url) as response:
-            response.raise_for_status()
-            
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
-            
-            with open(filepath, 'wb') as fd:
-                async for chunk in response.content.iter_chunked(16384):
-                    fd.write(chunk)
-                    downloaded += len(chunk)
-            
-            size_mb = total_size / (1024 * 1024)
-            print(f"{job_prefix}[{track_num}/{total_tracks}] ✓ {name} ({size_mb:.1f} MB)")
-            return True, total_size
+        total_size = await fetch_to_file_async(
+            session, url, filepath, f"{job_prefix}[{track_num}/{total_tracks}] ", limiter
+        )
+        
+        size_mb = total_size / (1024 * 1024)
+        print(f"{job_prefix}[{track_num}/{total_tracks}] ✓ {name} ({size_mb:.1f} MB)")
+        return True, total_size
             
     except Exception as e:
         print(f"{job_prefix}[{track_num}/{total_tracks}] ✗ {name} - Error: {str(e)}")
@@ -417,11 +779,10 @@ async def download_tracks_async(
     """
     # Create downloads directory structure
     downloads_dir = os.path.join('downloads', directory)
-    if not os.path.exists(downloads_dir):
-        os.makedirs(downloads_dir)
+    os.makedirs(downloads_dir, exist_ok=True)
     
     # Detect if running in Docker (no TTY)
-    is_docker = not sys.stdout.isatty()
+    is_docker = not _IS_TTY
     
     if not is_docker:
         job_prefix = f"[Job {job_id[:8]}] " if job_id else ""
@@ -436,59 +797,40 @@ async def download_tracks_async(
     failed = 0
     
     # Prepare download tasks
-    download_tasks = []
-    for i, track in enumerate(tracks, 1):
-        # Generate filename
-        if track.get('original_filename'):
-            filename = track['original_filename']
-        elif prefix and track.get('track_num'):
-            filename = f"{prefix}_{track['track_num']:03d}.mp3"
-        else:
-            safe_name = sanitize_filename(track['name'])
-            filename = f"{safe_name}.mp3"
-        
-        filepath = os.path.join(downloads_dir, filename)
-        
-        track_info = {
-            'num': i,
-            'total': len(tracks)
-        }
-        
-        download_tasks.append((track['url'], filepath, track_info))
+    download_tasks = build_download_tasks(tracks, downloads_dir, prefix)
     
-    # Create aiohttp session with connection limit
-    connector = aiohttp.TCPConnector(limit=max_workers)
-    async with aiohttp.ClientSession(connector=connector) as session:
-        # Process downloads with semaphore to limit concurrency
-        semaphore = asyncio.Semaphore(max_workers)
-        
-        async def download_with_semaphore(url, filepath, track_info):
-            async with semaphore:
-                return await download_file_async(session, url, filepath, track_info, job_id)
-        
-        # Start all downloads
-        tasks = []
-        for url, filepath, track_info in download_tasks:
-            task = asyncio.create_task(download_with_semaphore(url, filepath, track_info))
-            tasks.append(task)
+    # Reuse the shared session; the semaphore caps this job's concurrent
+    # connections, including the extra ones segmented downloads use
+    session = get_shared_session()
+    semaphore = asyncio.Semaphore(max_workers)
+    
+    async def download_with_semaphore(url, filepath, track_info):
+        async with semaphore:
+            return await download_file_async(session, url, filepath, track_info, job_id, semaphore)
+    
+    # Start all downloads
+    tasks = []
+    for url, filepath, track_info in download_tasks:
+        task = asyncio.create_task(download_with_semaphore(url, filepath, track_info))
+        tasks.append(task)
+    
+    # Process completions as they happen
+    for completed_task in asyncio.as_completed(tasks):
+        success, size = await completed_task
+        if success:
+            successful += 1
+        else:
+            failed += 1
         
-        # Process completions as they happen
-        for completed_task in asyncio.as_completed(tasks):
-            success, size = await completed_task
-            if success:
-                successful += 1
-            else:
-                failed += 1
-            
-            # Call progress callback if provided
-            if progress_callback:
-                should_continue = await progress_callback(successful, failed)
-                if not should_continue:
-                    # Cancel remaining tasks
-                    for task in tasks:
-                        if not task.done():
-                            task.cancel()
-                    break
+        # Call progress callback if provided
+        if progress_callback:
+            should_continue = await progress_callback(successful, failed)
+            if not should_continue:
+                # Cancel remaining tasks
+                for task in tasks:
+                    if not task.done():
+                        task.cancel()
+                break
     
     if not is_docker:
         print("-" * 80)
@@ -0,0 +1,164 @@
+"""Shared job state and update fan-out backed by Redis."""
+import os
+import orjson
+import asyncio
+import logging
+from typing import Optional, Dict, Any, Callable, Awaitable
+
+logger = logging.getLogger(__name__)
+
+# Key lifetimes and the pub/sub channel used to relay updates between workers
+JOB_TTL_SECONDS = 86400
+CANCEL_TTL_SECONDS = 3600
+UPDATES_CHANNEL = "jobs"
+
+# Backoff between attempts to resubscribe after the relay loses Redis
+RELAY_RETRY_MIN_SECONDS = 1
+RELAY_RETRY_MAX_SECONDS = 30
+
+# Redis client (None when REDIS_URL is not configured)
+_redis = None
+_relay_task: Optional[asyncio.Task] = None
+
+async def init_job_store(on_update: Callable[[Dict[str, Any]], Awaitable[None]]):
+    """Connect to Redis and relay published job updates to on_update."""
+    global _redis, _relay_task
+    redis_url = os.getenv("REDIS_URL")
+
+    if _redis:
+        return
+
+    if not redis_url:
+        logger.info("REDIS_URL not set, job state is kept in this process only")
+        return
+
+    try:
+        import redis.asyncio as aioredis
+        _redis = aioredis.Redis.from_url(redis_url)
+        await _redis.ping()
+        logger.info("Job store connected to Redis")
+    except Exception as e:
+        logger.error(f"Failed to connect to Redis job store: {e}")
+        _redis = None
+        return
+
+    _relay_task = asyncio.create_task(_relay_updates(on_update))
+    _relay_task.add_done_callback(_log_relay_exit)
+
+async def close_job_store():
+    """Stop relaying updates and close the Redis connection."""
+    global _redis, _relay_task
+    if _relay_task:
+        _relay_task.cancel()
+        _relay_task = None
+    if _redis:
+        await _redis.aclose()
+        _redis = None
+        logger.info("Job store connection closed")
+
+def is_enabled() -> bool:
+    """Return True when job state is shared through Redis."""
+    return _redis is not None
+
+def _log_relay_exit(task: asyncio.Task):
+    """Log the relay stopping for any reason other than shutdown."""
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error:
+        logger.error(f"Job update relay stopped: {error}")
+
+async def _relay_updates(on_update: Callable[[Dict[str, Any]], Awaitable[None]]):
+    """Pass every update published by any worker to on_update, resubscribing if Redis drops."""
+    delay = RELAY_RETRY_MIN_SECONDS
+    while True:
+        pubsub = _redis.pubsub()
+        try:
+            await pubsub.subscribe(UPDATES_CHANNEL)
+            delay = RELAY_RETRY_MIN_SECONDS
+            async for message in pubsub.listen():
+                if message['type'] != 'message':
+                    continue
+                try:
+                    await on_update(orjson.loads(message['data']))
+                except Exception as e:
+                    logger.warning(f"Failed to relay job update: {e}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Job update relay lost Redis, resubscribing in {delay}s: {e}")
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, RELAY_RETRY_MAX_SECONDS)
+
+async def save_job(job_id: str, job_data: Dict[str, Any]) -> bool:
+    """Store a JSON-serializable snapshot of a job."""
+    if not _redis:
+        return False
+
+    try:
+        await _redis.set(f"job:{job_id}", orjson.dumps(job_data), ex=JOB_TTL_SECONDS)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to save job {job_id[:8]}: {e}")
+        return False
+
+async def load_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Load a job snapshot saved by any worker."""
+    if not _redis:
+        return None
+
+    try:
+        data = await _redis.get(f"job:{job_id}")
+        return orjson.loads(data) if data else None
+    except Exception as e:
+        logger.error(f"Failed to load job {job_id[:8]}: {e}")
+        return None
+
+async def delete_job(job_id: str):
+    """Remove a job snapshot and its cancellation flag."""
+    if not _redis:
+        return
+
+    try:
+        await _redis.delete(f"job:{job_id}", f"cancel:{job_id}")
+    except Exception as e:
+        logger.error(f"Failed to delete job {job_id[:8]}: {e}")
+
+async def set_cancel_flag(job_id: str):
+    """Flag a job as cancelled for whichever worker is running it."""
+    if not _redis:
+        return
+
+    try:
+        await _redis.set(f"cancel:{job_id}", 1, ex=CANCEL_TTL_SECONDS)
+    except Exception as e:
+        logger.error(f"Failed to set cancel flag for job {job_id[:8]}: {e}")
+
+async def is_cancelled(job_id: str) -> bool:
+    """Check whether any worker has flagged a job as cancelled."""
+    if not _redis:
+        return False
+
+    try:
+        return bool(await _redis.exists(f"cancel:{job_id}"))
+    except Exception as e:
+        logger.error(f"Failed to read cancel flag for job {job_id[:8]}: {e}")
+        return False
+
+async def publish_job_update(message: Dict[str, Any]) -> bool:
+    """Publish a job update to every worker."""
+    if not _redis:
+        return False
+
+    try:
+        await _redis.publish(UPDATES_CHANNEL, orjson.dumps(message))
+        return True
+    except Exception as e:
+        logger.error(f"Failed to publish job update: {e}")
+        return False
@@ -1,102 +1,88 @@
 #!/usr/bin/env python3
 import argparse
-import importlib
-import requests
 from bs4 import BeautifulSoup
 import sys
 import os
-import re
-from downloader import download_tracks
+import logging
+from functools import lru_cache
+from downloader import download_tracks, sanitize_filename
 from player_info import get_player_info
+from scrapers.parsing import HTML_PARSER, AudioLinkFilter, detect_players
+from scrapers.session import PAGE_SESSION
+from scrapers import PLUGIN_MODULES, get_scraper
+from scrapers.cache import load_cached, save_cached, is_fresh, enable_cache, bypass_cache
+
+# Detection results are kept on disk so re-runs against the same URL skip the fetch
+DETECT_CACHE_TTL = 3600
 
 def detect_plugin(url):
     """
     Detect which audio streaming plugin a website is using.
-    Returns a tuple of (plugin_name, is_supported).
+    Returns the list of (plugin_name, is_supported) detections and the page
+    response, so the scraper can reuse it. The response is None when the
+    detections came from the cache or the page couldn't be fetched.
+    
+    Results are cached on disk for DETECT_CACHE_TTL seconds; after that a
+    cached entry is revalidated with the page's ETag when it had one.
     """
+    cached = load_cached('detect', url)
+    
+    if cached and is_fresh(cached, DETECT_CACHE_TTL):
+        return [tuple(d) for d in cached['data']], None
+    
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        html = response.text.lower()
-        html_original = response.text  # Keep original case for some checks
-        
-        # List of all known audio players
-        detections = []
-        
-        # Check for Plyr (supported)
-        if 'plyr' in html or 'new plyr' in html:
-            detections.append(('plyr', True))
+        headers = {'If-None-Match': cached['etag']} if cached and cached.get('etag') else {}
+        response = PAGE_SESSION.get(url, headers=headers, timeout=30)
         
-        # Check for Howler.js (not yet supported)
-        if 'howler' in html or 'howl(' in html or 'howler.js' in html:
-            detections.append(('howler', False))
+        # Page unchanged since it was last detected
+        if response.status_code == 304:
+            save_cached('detect', url, cached['data'], cached['etag'])
+            return [tuple(d) for d in cached['data']], None
         
-        # Check for MediaElement.js (not yet supported)
-        # More comprehensive detection patterns
-        mediaelement_patterns = [
-            'mediaelement',
-            'mejsplayer',
-            'mejs',
-            'mejs-',
-            'wp-mediaelement',  # WordPress integration
-            'mediaelement-and-player',
-            'mediaelementplayer',
-            'mejs__',  # BEM naming convention
-        ]
-        if any(pattern in html for pattern in mediaelement_patterns):
-            detections.append(('mediaelement', False))
-        
-        # Check for Video.js (not yet supported)
-        if 'video-js' in html or 'videojs' in html:
-            detections.append(('videojs', False))
-        
-        # Check for JW Player (not yet supported)
-        if 'jwplayer' in html or 'jwplatform' in html:
-            detections.append(('jwplayer', False))
+        response.raise_for_status()
         
-        # Check for HTML5 audio elements (not yet supported as a dedicated scraper)
-        if '<audio' in html:
-            detections.append(('html5audio', False))
+        # Check for all known audio players in a single pass over the raw bytes
+        detections = detect_players(response.content)
         
-        # Check for SoundCloud embeds (not yet supported)
-        if 'soundcloud.com' in html or 'soundcloud-widget' in html:
-            detections.append(('soundcloud', False))
+        # Check for simple audio file links (supported) - check this last.
+        # A supported player is always preferred over plain links, so the
+        # page is only parsed when none was found.
+        if not any(is_supported for _, is_supported in detections):
+            # Only the audio links themselves are built into the tree
+            soup = BeautifulSoup(response.content, HTML_PARSER, parse_only=AudioLinkFilter())
+            audio_links = soup.contents
+            if audio_links:
+                detections.append(('simple', True))
         
-        # Check for Spotify embeds (not yet supported)
-        if 'spotify.com/embed' in html:
-            detections.append(('spotify', False))
+        if detections:
+            save_cached('detect', url, detections, response.headers.get('ETag'))
         
-        # Check for simple audio file links (supported) - check this last
-        soup = BeautifulSoup(html_original, 'html.parser')
-        audio_extensions = ('.mp3', '.m4a', '.aac', '.ogg', '.opus', '.webm', '.wav', '.flac')
-        audio_links = soup.find_all(lambda tag: 
-            (tag.name == 'a' and tag.get('href', '') and any(tag.get('href', '').lower().endswith(ext) for ext in audio_extensions)) or
-            (tag.get('data-url', '') and any(tag.get('data-url', '').lower().endswith(ext) for ext in audio_extensions))
-        )
-        if audio_links:
-            detections.append(('simple', True))
-        
-        return detections
+        return detections, response
         
     except Exception as e:
         print(f"Error detecting plugin: {e}")
-        return []
+        return [], None
 
+@lru_cache(maxsize=1)
 def get_available_plugins():
     """Get list of available scraper plugins."""
-    plugins = []
-    
-    # Check for scraper modules
-    if os.path.exists('scrapers/simple_audio_scraper.py'):
-        plugins.append('simple')
-    if os.path.exists('scrapers/scrape_plyr.py'):
-        plugins.append('plyr')
-    
-    # Add more plugins here as they're created
+    # List the scraper modules once instead of checking each plugin's file
+    scrapers_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scrapers')
+    with os.scandir(scrapers_dir) as entries:
+        names = {entry.name for entry in entries if entry.is_file() and entry.name.endswith('.py')}
     
-    return plugins
+    return [plugin for plugin, module in PLUGIN_MODULES.items() if f'{module}.py' in names]
 
 def main():
+    # Download progress is reported through the downloader's logger; print it
+    # to stdout with the rest of the output, leaving other libraries' logging alone
+    progress_handler = logging.StreamHandler(sys.stdout)
+    progress_handler.setFormatter(logging.Formatter('%(message)s'))
+    downloader_logger = logging.getLogger('downloader')
+    downloader_logger.addHandler(progress_handler)
+    downloader_logger.setLevel(logging.INFO)
+    downloader_logger.propagate = False
+    
     parser = argparse.ArgumentParser(
         description='Comprehensive audio scraper supporting multiple streaming plugins.'
     )
@@ -118,9 +104,24 @@ def main():
         type=int,
         default=5
     )
+    parser.add_argument(
+        '--resume',
+        help='Continue downloading into an existing directory, skipping finished tracks',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--no-cache',
+        help='Re-detect the audio player and re-scrape tracks instead of reusing cached results',
+        action='store_true'
+    )
     
     args = parser.parse_args()
     
+    # Scrape results are cached for the CLI only, where --no-cache can bypass them
+    enable_cache()
+    if args.no_cache:
+        bypass_cache()
+    
     # Generate a fallback name if none provided
     if args.name is None:
         # Try to extract a meaningful name from the URL
@@ -131,8 +132,7 @@ def main():
         path_parts = [p for p in parsed_url.path.strip('/').split('/') if p]
         if path_parts:
             # Use the last path segment, cleaned up
-            args.name = re.sub(r'[^\w\s-]', '', path_parts[-1])
-            args.name = re.sub(r'[-\s]+', '-', args.name)
+            args.name = sanitize_filename(path_parts[-1])
         else:
             # Use the domain name as fallback
             args.name = parsed_url.netloc.replace('.', '-')
@@ -150,19 +150,23 @@ def main():
     
     # Check if download directory already exists before doing anything else
     downloads_dir = os.path.join('downloads', args.directory)
-    if os.path.exists(downloads_dir):
+    if os.path.exists(downloads_dir) and not args.resume:
         print(f"\nError: Directory 'downloads/{args.directory}' already exists!")
         print("Please choose a different name or remove the existing directory.")
         print(f"To remove: rm -rf downloads/{args.directory}")
+        print("To finish an interrupted download into it, add --resume")
         sys.exit(1)
     
+    # Page fetched during detection, reused by the scraper
+    page_response = None
+    
     # Determine which plugin to use
     if args.plugin:
         plugin_name = args.plugin
         print(f"Using manually specified plugin: {plugin_name}")
     else:
         print("Auto-detecting audio player...")
-        detections = detect_plugin(args.url)
+        detections, page_response = detect_plugin(args.url)
         
         if not detections:
             print("\nError: Could not detect any audio player on this page.")
@@ -214,45 +218,33 @@ def main():
     
     # Import and run the appropriate scraper
     try:
-        if plugin_name == 'simple':
-            module_name = 'scrapers.simple_audio_scraper'
-        elif plugin_name == 'plyr':
-            module_name = 'scrapers.scrape_plyr'
-        else:
-            raise ValueError(f"Unknown plugin: {plugin_name}")
-        
-        # Dynamically import the scraper module
-        scraper = importlib.import_module(module_name)
-        
-        # Call the scraper's main function
-        # Each scraper should have a scrape() function that returns track metadata
-        if hasattr(scraper, 'scrape'):
-            tracks = scraper.scrape(args.url, args.name, args.directory)
-            if tracks:
-                # Download the tracks using the common downloader
-                result = download_tracks(
-                    tracks, 
-                    args.directory, 
-                    prefix=args.name if plugin_name == 'simple' else None,
-                    max_workers=args.workers
-                )
-                if result.get('error'):
-                    sys.exit(1)
-                elif result['failed'] > 0:
-                    print(f"\nWarning: {result['failed']} downloads failed.")
-                    sys.exit(2)
-                else:
-                    print(f"\nAll downloads completed successfully!")
-            else:
-                print("Error: No tracks found to download")
+        # Each scraper's scrape() function returns track metadata
+        scrape = get_scraper(plugin_name)
+        tracks = scrape(
+            args.url, args.name, args.directory,
+            prefetched_response=page_response, max_workers=args.workers
+        )
+        if tracks:
+            # Download the tracks using the common downloader
+            result = download_tracks(
+                tracks, 
+                args.directory, 
+                prefix=args.name if plugin_name == 'simple' else None,
+                max_workers=args.workers
+            )
+            if result.get('error'):
                 sys.exit(1)
+            elif result['failed'] > 0:
+                print(f"\nWarning: {result['failed']} downloads failed.")
+                sys.exit(2)
+            else:
+                print(f"\nAll downloads completed successfully!")
         else:
-            print(f"Error: {module_name} does not have a scrape() function")
+            print("Error: No tracks found to download")
             sys.exit(1)
             
     except ImportError as e:
-        print(f"Error: Could not import {module_name}: {e}")
-        print(f"Make sure {module_name}.py exists")
+        print(f"Error: Could not import the {plugin_name} scraper: {e}")
         sys.exit(1)
     except Exception as e:
         print(f"Error running scraper: {e}")
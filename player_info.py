@@ -1,117 +1,124 @@
 """
 Information about various audio players and their characteristics.
 """
+from functools import lru_cache
 
 PLAYER_INFO = {
     'plyr': {
         'name': 'Plyr',
         'description': 'Modern, accessible HTML5 media player',
         'supported': True,
-        'characteristics': [
+        'characteristics': (
             'Often used for audiobooks and podcasts',
             'Supports playlists and chapters',
             'May use APIs to load track URLs'
-        ]
+        )
     },
     'simple': {
         'name': 'Simple Audio Links',
         'description': 'Direct audio file links on the page',
         'supported': True,
-        'characteristics': [
+        'characteristics': (
             'Direct download links for audio files',
             'Supports MP3, M4A, AAC, OGG, OPUS, WebM, WAV, FLAC',
             'No JavaScript required',
             'Preserves original filenames'
-        ]
+        )
     },
     'simple_mp3': {  # Keep for backwards compatibility
         'name': 'Simple Audio Links',
         'description': 'Direct audio file links on the page',
         'supported': True,
-        'characteristics': [
+        'characteristics': (
             'Direct download links for audio files',
             'Supports MP3, M4A, AAC, OGG, OPUS, WebM, WAV, FLAC',
             'No JavaScript required',
             'Preserves original filenames'
-        ]
+        )
     },
     'howler': {
         'name': 'Howler.js',
         'description': 'JavaScript audio library for the modern web',
         'supported': False,
-        'characteristics': [
+        'characteristics': (
             'Used by music streaming sites',
             'Game development platforms',
             'Often has custom player UI'
-        ]
+        )
     },
     'mediaelement': {
         'name': 'MediaElement.js',
         'description': 'HTML5 audio and video player',
         'supported': False,
-        'characteristics': [
+        'characteristics': (
             'WordPress default player',
             'Educational platforms',
             'Supports multiple formats'
-        ]
+        )
     },
     'videojs': {
         'name': 'Video.js',
         'description': 'Open source HTML5 video player',
         'supported': False,
-        'characteristics': [
+        'characteristics': (
             'Used by video platforms',
             'Also handles audio content',
             'Highly customizable'
-        ]
+        )
     },
     'jwplayer': {
         'name': 'JW Player',
         'description': 'Commercial media player',
         'supported': False,
-        'characteristics': [
+        'characteristics': (
             'Enterprise platforms',
             'DRM protection common',
             'Complex API'
-        ]
+        )
     },
     'html5audio': {
         'name': 'HTML5 Audio',
         'description': 'Native HTML5 <audio> elements',
         'supported': False,
-        'characteristics': [
+        'characteristics': (
             'Basic browser player',
             'No special library needed',
             'Simple implementation'
-        ]
+        )
     },
     'soundcloud': {
         'name': 'SoundCloud',
         'description': 'SoundCloud embedded player',
         'supported': False,
-        'characteristics': [
+        'characteristics': (
             'Embedded iframe player',
             'Requires API access',
             'Stream protection'
-        ]
+        )
     },
     'spotify': {
         'name': 'Spotify',
         'description': 'Spotify embedded player',
         'supported': False,
-        'characteristics': [
+        'characteristics': (
             'Embedded iframe player',
             'Requires authentication',
             'DRM protected'
-        ]
+        )
     }
 }
 
-def get_player_info(player_id):
-    """Get information about a specific player."""
-    return PLAYER_INFO.get(player_id, {
+@lru_cache(maxsize=32)
+def _unknown_player_info(player_id):
+    """Build the placeholder info for a player id missing from PLAYER_INFO."""
+    return {
         'name': player_id,
         'description': 'Unknown player type',
         'supported': False,
-        'characteristics': []
-    })
\ No newline at end of file
+        'characteristics': ()
+    }
+
+def get_player_info(player_id):
+    """Get information about a specific player."""
+    info = PLAYER_INFO.get(player_id)
+    return info if info is not None else _unknown_player_info(player_id)
\ No newline at end of file
@@ -1,2 +1,26 @@
 # Scrapers package
-# This package contains all the audio scraper modules for different platforms
\ No newline at end of file
+# This package contains all the audio scraper modules for different platforms
+import importlib
+from functools import lru_cache
+
+
+# Scraper module (within this package) for each plugin name
+PLUGIN_MODULES = {
+    'simple': 'simple_audio_scraper',
+    'plyr': 'scrape_plyr',
+    # Add more plugins here as they're created
+}
+
+# Older plugin names that map onto a current one
+PLUGIN_ALIASES = {
+    'simple_mp3': 'simple',  # Keep for backwards compatibility
+}
+
+
+@lru_cache(maxsize=None)
+def get_scraper(plugin):
+    """Return the scrape() function for a plugin, importing its module on first use."""
+    module = PLUGIN_MODULES.get(PLUGIN_ALIASES.get(plugin, plugin))
+    if module is None:
+        raise ValueError(f"Unknown plugin: {plugin}")
+    return importlib.import_module(f'{__name__}.{module}').scrape
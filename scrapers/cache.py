@@ -0,0 +1,79 @@
+"""
+On-disk cache of scraping results, keyed by page URL.
+
+The cache is off unless a process turns it on with enable_cache. The CLI
+does; the web server doesn't, since it has no way to bypass the cache.
+"""
+import os
+import time
+import tempfile
+import hashlib
+import orjson
+
+CACHE_ROOT = os.path.join(os.getenv('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'audiofetch')
+
+# Whether entries are read and written at all (turned on by enable_cache)
+_enabled = False
+# Whether existing entries are used (turned off by bypass_cache)
+_use_cached = True
+
+
+def enable_cache():
+    """Read and write cache entries for the rest of the run."""
+    global _enabled
+    _enabled = True
+
+
+def bypass_cache():
+    """Ignore existing entries for the rest of the run; new results are still saved."""
+    global _use_cached
+    _use_cached = False
+
+
+def cache_path(kind, url):
+    """Get the cache file holding one kind of result (e.g. 'detect') for a URL."""
+    return os.path.join(CACHE_ROOT, kind, f"{hashlib.sha1(url.encode()).hexdigest()}.json")
+
+
+def load_cached(kind, url):
+    """
+    Load a cached entry with 'data', 'etag' and 'saved_at' keys,
+    or None if there isn't a usable one.
+    """
+    if not _enabled or not _use_cached:
+        return None
+    
+    try:
+        with open(cache_path(kind, url), 'rb') as f:
+            entry = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    return entry if isinstance(entry, dict) and 'data' in entry else None
+
+
+def is_fresh(entry, ttl):
+    """Check whether a cached entry is younger than ttl seconds."""
+    return time.time() - entry.get('saved_at', 0) < ttl
+
+
+def save_cached(kind, url, data, etag=None):
+    """Write an entry to the cache, ignoring filesystem errors."""
+    if not _enabled:
+        return
+    
+    path = cache_path(kind, url)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # A temp file per write, so concurrent saves of one URL never interleave
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(orjson.dumps({'data': data, 'etag': etag, 'saved_at': time.time()}))
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
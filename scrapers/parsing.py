@@ -0,0 +1,100 @@
+"""
+Shared HTML parsing settings for plugin detection and the scrapers.
+"""
+import re
+import soupsieve
+from bs4.filter import ElementFilter
+
+# Prefer the C-backed lxml parser, falling back to the pure-Python one
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Audio file extensions recognised in links
+AUDIO_EXTENSIONS = ('.mp3', '.m4a', '.aac', '.ogg', '.opus', '.webm', '.wav', '.flac')
+
+# An audio extension at the end of a URL, optionally followed by a query or fragment
+_AUDIO_EXT_RE = re.compile(
+    r'\.(' + '|'.join(ext[1:] for ext in AUDIO_EXTENSIONS) + r')(?:$|[?#])', re.IGNORECASE
+)
+
+
+def audio_extension(url):
+    """Return the lowercase audio extension of a link (e.g. '.mp3'), or None."""
+    match = _AUDIO_EXT_RE.search(url) if url else None
+    return f'.{match.group(1).lower()}' if match else None
+
+
+def is_audio_url(url):
+    """Check whether a link points at an audio file."""
+    return bool(url) and _AUDIO_EXT_RE.search(url) is not None
+
+
+# Compiled once: <a> tags whose href, or any tag whose data-url, mentions an
+# audio extension. Candidates are confirmed with is_audio_url, since a CSS
+# suffix match would miss links carrying a query string.
+AUDIO_LINK_SELECTOR = soupsieve.compile(', '.join(
+    [f'a[href*="{ext}" i]' for ext in AUDIO_EXTENSIONS] +
+    [f'[data-url*="{ext}" i]' for ext in AUDIO_EXTENSIONS]
+))
+
+
+class AudioLinkFilter(ElementFilter):
+    """
+    Parse-time filter that only builds <a> tags linking to audio files and
+    tags with an audio data-url, so the rest of the page is never turned
+    into a tree. Pass an instance as BeautifulSoup's parse_only argument;
+    the matching tags become the top-level contents of the soup.
+    """
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        attrs = attrs or {}
+        return (name == 'a' and is_audio_url(attrs.get('href'))) or is_audio_url(attrs.get('data-url'))
+
+    def allow_string_creation(self, string):
+        # Text inside a matching tag is kept; text between them is not needed
+        return False
+
+
+# Known audio players as (plugin name, supported, lowercase fingerprints),
+# listed in the order detections are reported
+PLAYER_FINGERPRINTS = [
+    ('plyr', True, ('plyr', 'new plyr')),
+    ('howler', False, ('howler', 'howl(', 'howler.js')),
+    ('mediaelement', False, (
+        'mediaelement',
+        'mejsplayer',
+        'mejs',
+        'mejs-',
+        'wp-mediaelement',  # WordPress integration
+        'mediaelement-and-player',
+        'mediaelementplayer',
+        'mejs__',  # BEM naming convention
+    )),
+    ('videojs', False, ('video-js', 'videojs')),
+    ('jwplayer', False, ('jwplayer', 'jwplatform')),
+    ('html5audio', False, ('<audio',)),
+    ('soundcloud', False, ('soundcloud.com', 'soundcloud-widget')),
+    ('spotify', False, ('spotify.com/embed',)),
+]
+
+_FINGERPRINT_PLAYERS = {
+    pattern.encode(): name for name, _, patterns in PLAYER_FINGERPRINTS for pattern in patterns
+}
+
+# One case-insensitive alternation over every fingerprint, longest first,
+# so the raw page bytes are scanned once without a lowercased copy
+_FINGERPRINT_RE = re.compile(b'|'.join(
+    re.escape(pattern) for pattern in sorted(_FINGERPRINT_PLAYERS, key=len, reverse=True)
+), re.IGNORECASE)
+
+
+def detect_players(content):
+    """
+    Find the known audio players fingerprinted in the raw page bytes.
+    Returns a list of (plugin_name, is_supported) tuples.
+    """
+    found = {_FINGERPRINT_PLAYERS[match.group().lower()] for match in _FINGERPRINT_RE.finditer(content)}
+    return [(name, supported) for name, supported, _ in PLAYER_FINGERPRINTS if name in found]
@@ -1,48 +1,97 @@
-import requests
 from bs4 import BeautifulSoup
 import re
-import json
+import asyncio
+import aiohttp
+import orjson
 from urllib.parse import urljoin
-from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    from scrapers.session import PAGE_SESSION, HTTP_RETRY
+    from scrapers.cache import load_cached, save_cached, is_fresh
+except ImportError:
+    # Running this file directly puts scrapers/ itself on the path
+    from session import PAGE_SESSION, HTTP_RETRY
+    from cache import load_cached, save_cached, is_fresh
+
+# Track extraction patterns, compiled once at import. They match the raw page
+# bytes, so the page is never decoded as a whole, and are combined into one
+# alternation so the page is scanned a single time.
+_JS_TRACKS_RE = re.compile(
+    # Pattern 1: a tracks array in JavaScript, matching just the array
+    rb'(?i:(?:var\s+)?tracks\s*=\s*(?P<tracks>\[[^\]]*(?:\[[^\]]*\][^\]]*)*\])\s*[,;])'
+    # Pattern 2: myPost() function URLs (common in some audiobook sites)
+    rb'|myPost\([\'"](?P<post>[^\'"]+)[\'"]\)'
+    # Pattern 3: Plyr source configurations
+    rb'|source\s*:\s*[\'"](?P<source>[^\'"]+\.mp3)[\'"]'
+)
+_TRAILING_OBJECT_COMMA_RE = re.compile(rb',\s*}')
+_TRAILING_ARRAY_COMMA_RE = re.compile(rb',\s*]')
+
+# Dropbox link patterns
+_DROPBOX_RES = [
+    re.compile(rb'https?://[^"\s]*dropbox[^"\s]*\.mp3[^"\s]*', re.IGNORECASE),
+    re.compile(rb'[\'"]([^\'"\s]*dropbox[^\'"\s]*\.mp3[^\'"\s]*)[\'"]', re.IGNORECASE),
+    re.compile(rb'chapter_link_dropbox[\'"]?\s*:\s*[\'"]([^\'"\s]+)[\'"]', re.IGNORECASE)
+]
+
+# Chapter MP3 link API
+MP3_API_URL = "https://api.galaxyaudiobook.com/api/getMp3Link"
+MP3_API_HEADERS = {
+    'Content-Type': 'application/json; charset=utf-8'
+}
+
+# Parallel chapter lookups when the caller doesn't choose a worker count
+API_WORKERS = 10
+# Per-lookup limit for a chapter API call
+API_TIMEOUT = aiohttp.ClientTimeout(total=30)
+
+# Track lists parsed from a page are reused for a day, then revalidated with its ETag
+TRACKS_CACHE_TTL = 86400
 
 
 def extract_tracks_from_javascript(html_content):
     """
-    Extract track information from JavaScript in the HTML.
+    Extract track information from JavaScript in the raw page bytes.
     Looks for various patterns used by Plyr-based audiobook sites.
     """
     tracks = []
     
-    # Pattern 1: Look for tracks array in JavaScript
-    # More precise pattern to match just the array
-    tracks_pattern = r'(?:var\s+)?tracks\s*=\s*(\[[^\]]*(?:\[[^\]]*\][^\]]*)*\])\s*[,;]'
-    match = re.search(tracks_pattern, html_content, re.IGNORECASE | re.DOTALL)
+    # Collect the matches for every pattern in one pass over the page
+    tracks_array = None
+    post_matches = []
+    plyr_matches = []
+    for match in _JS_TRACKS_RE.finditer(html_content):
+        kind = match.lastgroup
+        if kind == 'tracks':
+            # Only the first tracks array is used
+            if tracks_array is None:
+                tracks_array = match.group('tracks')
+        elif kind == 'post':
+            post_matches.append(match.group('post'))
+        else:
+            plyr_matches.append(match.group('source'))
     
-    if match:
+    # Pattern 1: Look for tracks array in JavaScript
+    if tracks_array is not None:
         try:
             # Extract the JavaScript array
-            tracks_str = match.group(1)
+            tracks_str = tracks_array
             
             # Clean up JavaScript syntax to make it valid JSON
             # First, handle the trailing commas after the last property in objects
-            tracks_str = re.sub(r',\s*}', '}', tracks_str)  # Remove trailing commas before }
-            tracks_str = re.sub(r',\s*]', ']', tracks_str)  # Remove trailing commas before ]
-            
-            # Check if keys are already quoted (look for pattern like "key":)
-            if '"track":' in tracks_str:
-                # Keys are already quoted, just rename 'track' to 'track_num'
-                tracks_str = tracks_str.replace('"track":', '"track_num":')
+            tracks_str = _TRAILING_OBJECT_COMMA_RE.sub(b'}', tracks_str)  # Remove trailing commas before }
+            tracks_str = _TRAILING_ARRAY_COMMA_RE.sub(b']', tracks_str)  # Remove trailing commas before ]
             
             # Try to parse the cleaned JSON
             try:
-                tracks_data = json.loads(tracks_str)
-            except json.JSONDecodeError as je:
+                tracks_data = orjson.loads(tracks_str)
+            except orjson.JSONDecodeError as je:
                 print(f"JSON parsing error: {je}")
                 print(f"Error at position {je.pos} in cleaned tracks string")
                 # Print a snippet around the error position for debugging
                 start = max(0, je.pos - 50)
                 end = min(len(tracks_str), je.pos + 50)
-                print(f"Context: ...{tracks_str[start:end]}...")
+                print(f"Context: ...{tracks_str[start:end].decode(errors='replace')}...")
                 raise
             
             for track in tracks_data:
@@ -73,10 +122,15 @@ def extract_tracks_from_javascript(html_content):
         except Exception as e:
             print(f"Error parsing tracks array: {e}")
     
+    # A parsed tracks array is the full playlist; the other patterns would
+    # only repeat its entries, so they are a fallback for pages without one
+    # whose entries can resolve to a URL
+    if any(t['url'] or t['chapter_id'] != '0' for t in tracks):
+        return tracks
+    
     # Pattern 2: Look for myPost() function URLs (common in some audiobook sites)
-    post_pattern = r'myPost\([\'"]([^\'"]+)[\'"]\)'
-    post_matches = re.findall(post_pattern, html_content)
     for i, url in enumerate(post_matches):
+        url = url.decode(errors='replace')
         if url and ('.mp3' in url or 'dropbox' in url):
             tracks.append({
                 'url': url,
@@ -85,11 +139,9 @@ def extract_tracks_from_javascript(html_content):
             })
     
     # Pattern 3: Look for Plyr source configurations
-    plyr_pattern = r'source\s*:\s*[\'"]([^\'"]+\.mp3)[\'"]'
-    plyr_matches = re.findall(plyr_pattern, html_content)
     for i, url in enumerate(plyr_matches):
         tracks.append({
-            'url': url,
+            'url': url.decode(errors='replace'),
             'name': f'Track {i + 1}',
             'chapter_id': i + 1
         })
@@ -97,62 +149,117 @@ def extract_tracks_from_javascript(html_content):
     return tracks
 
 
-def fetch_mp3_url_from_api(chapter_id, server_type=1):
+async def fetch_mp3_url_from_api(session, chapter_id, server_type=1):
     """
-    Fetch the actual MP3 URL from the API using chapter ID.
+    Fetch the actual MP3 URL from the API using chapter ID, retrying
+    transient gateway errors with the same backoff as PAGE_SESSION.
     """
-    api_url = "https://api.galaxyaudiobook.com/api/getMp3Link"
-    headers = {
-        'Content-Type': 'application/json; charset=utf-8',
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }
-    
     payload = {
         "chapterId": int(chapter_id),
         "serverType": server_type
     }
     
-    try:
-        response = requests.post(api_url, json=payload, headers=headers, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-        return data.get('link_mp3')
-    except Exception as e:
-        print(f"Error fetching MP3 URL for chapter {chapter_id}: {e}")
-        return None
+    for attempt in range(HTTP_RETRY.total + 1):
+        if attempt:
+            await asyncio.sleep(HTTP_RETRY.backoff_factor * 2 ** (attempt - 1))
+        try:
+            async with session.post(MP3_API_URL, data=orjson.dumps(payload), headers=MP3_API_HEADERS, timeout=API_TIMEOUT) as response:
+                if response.status in HTTP_RETRY.status_forcelist and attempt < HTTP_RETRY.total:
+                    continue
+                response.raise_for_status()
+                data = orjson.loads(await response.read())
+            return data.get('link_mp3')
+        except Exception as e:
+            print(f"Error fetching MP3 URL for chapter {chapter_id}: {e}")
+            return None
+
+
+async def fetch_api_tracks(api_tracks, max_connections):
+    """
+    Look up the MP3 URL of every track over one pooled aiohttp session,
+    with at most max_connections requests in flight.
+    """
+    connector = aiohttp.TCPConnector(limit=max_connections, ttl_dns_cache=300)
+    headers = {'User-Agent': PAGE_SESSION.headers['User-Agent']}
+    async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+        mp3_urls = await asyncio.gather(
+            *(fetch_mp3_url_from_api(session, track['chapter_id']) for track in api_tracks)
+        )
+    
+    for track, mp3_url in zip(api_tracks, mp3_urls):
+        if mp3_url:
+            track['url'] = mp3_url
 
 
 def extract_dropbox_links(html_content, base_url):
     """
-    Extract and construct Dropbox links from the HTML.
+    Extract and construct Dropbox links from the raw page bytes.
     Many audiobook sites use Dropbox for hosting.
     """
-    links = []
+    # Keys keep the links in the order found while dropping duplicates
+    links = {}
     
     # Look for Dropbox patterns
-    dropbox_patterns = [
-        r'https?://[^"\s]*dropbox[^"\s]*\.mp3[^"\s]*',
-        r'[\'"]([^\'"\s]*dropbox[^\'"\s]*\.mp3[^\'"\s]*)[\'"]',
-        r'chapter_link_dropbox[\'"]?\s*:\s*[\'"]([^\'"\s]+)[\'"]'
-    ]
-    
-    for pattern in dropbox_patterns:
-        matches = re.findall(pattern, html_content, re.IGNORECASE)
+    for pattern in _DROPBOX_RES:
+        matches = pattern.findall(html_content)
         for match in matches:
+            match = match.decode(errors='replace')
             if match and '.mp3' in match:
                 # Handle relative Dropbox paths
                 if not match.startswith('http'):
                     # Could be a path like "audiobook_name/file.mp3"
                     match = f"https://dl.dropboxusercontent.com/s/{match}"
-                links.append(match)
+                links[match] = None
+    
+    return list(links)
+
+
+def resolve_tracks(tracks, max_workers=None):
+    """
+    Look up the MP3 URL of every track that needs the chapter API, in
+    parallel, and keep the tracks that end up with a URL.
+    
+    Returns:
+        List of track dictionaries with 'url' and 'name' keys,
+        or None if no track has a URL.
+    """
+    # Fetch MP3 URLs for tracks that need API calls using parallel requests
+    api_tracks = [t for t in tracks if t.get('needs_api') and t.get('chapter_id') != '0']
+    
+    if api_tracks:
+        print(f"\nFetching MP3 URLs from API for {len(api_tracks)} tracks...")
+        
+        asyncio.run(fetch_api_tracks(api_tracks, max_workers or API_WORKERS))
+    
+    # Filter out tracks without URLs
+    tracks_with_urls = [t for t in tracks if t.get('url')]
+    
+    if not tracks_with_urls:
+        print("No audio tracks found. This might require a more advanced scraping method.")
+        print("Consider using the scrape_with_playwright.py for JavaScript-heavy sites.")
+        return None
     
-    return list(set(links))  # Remove duplicates
+    print(f"\nFound {len(tracks_with_urls)} audio tracks:")
+    for i, track in enumerate(tracks_with_urls, 1):
+        print(f"  {i:2d}. {track['name']:<40} {track['url']}")
+    
+    return tracks_with_urls
 
 
-def scrape(url, prefix=None, directory=None):
+def scrape(url, prefix=None, directory=None, prefetched_response=None, max_workers=None):
     """
     Extract audio track metadata from Plyr-based audio players.
     
+    A response already fetched for the page (e.g. during plugin detection)
+    can be passed as prefetched_response to skip fetching it again.
+    max_workers sets how many chapter URLs are looked up in parallel. This
+    runs its own event loop, so call it from a worker thread in async code.
+    
+    The tracks parsed from the page are cached on disk for TRACKS_CACHE_TTL
+    seconds, and reused after that for as long as the page's ETag is
+    unchanged. Chapter URLs from the API may expire, so they are looked up
+    again on every call.
+    
     Returns:
         List of track dictionaries with 'url' and 'name' keys,
         or None if scraping fails.
@@ -161,53 +268,38 @@ def scrape(url, prefix=None, directory=None):
     print("Fetching page content...")
     
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
+        cached = load_cached('tracks', url)
+        if cached and is_fresh(cached, TRACKS_CACHE_TTL):
+            print(f"Using {len(cached['data'])} cached tracks for this page")
+            return resolve_tracks(cached['data'], max_workers)
         
-        html_content = response.text
+        response = prefetched_response
+        if response is None:
+            headers = {'If-None-Match': cached['etag']} if cached and cached.get('etag') else {}
+            response = PAGE_SESSION.get(url, headers=headers, timeout=30)
+            if response.status_code != 304:
+                response.raise_for_status()
+        
+        # Page unchanged since its tracks were cached
+        etag = response.headers.get('ETag')
+        if cached and (response.status_code == 304 or (etag and etag == cached.get('etag'))):
+            print(f"Page unchanged, using {len(cached['data'])} cached tracks")
+            save_cached('tracks', url, cached['data'], cached['etag'])
+            return resolve_tracks(cached['data'], max_workers)
+        
+        # The patterns run over the raw bytes, skipping a decode of the whole page
+        html_content = response.content
         
         # Extract tracks from JavaScript
         print("Analyzing page for Plyr audio tracks...")
         tracks = extract_tracks_from_javascript(html_content)
         
-        # Fetch MP3 URLs for tracks that need API calls using parallel requests
-        api_tracks = [t for t in tracks if t.get('needs_api') and t.get('chapter_id') != '0']
-        
-        if api_tracks:
-            print(f"\nFetching MP3 URLs from API for {len(api_tracks)} tracks...")
-            
-            with ThreadPoolExecutor(max_workers=10) as executor:
-                future_to_track = {
-                    executor.submit(fetch_mp3_url_from_api, track['chapter_id']): track 
-                    for track in api_tracks
-                }
-                
-                for future in as_completed(future_to_track):
-                    track = future_to_track[future]
-                    try:
-                        mp3_url = future.result()
-                        if mp3_url:
-                            track['url'] = mp3_url
-                    except Exception as e:
-                        print(f"  ✗ Failed to get URL for: {track['name']} - {e}")
-        
-        # Filter out tracks without URLs
-        tracks_with_urls = [t for t in tracks if t.get('url')]
-        
-        if not tracks_with_urls:
-            print("No audio tracks found. This might require a more advanced scraping method.")
-            print("Consider using the scrape_with_playwright.py for JavaScript-heavy sites.")
-            return None
-        
-        print(f"\nFound {len(tracks_with_urls)} audio tracks:")
-        for i, track in enumerate(tracks_with_urls, 1):
-            print(f"  {i:2d}. {track['name']:<40} {track['url']}")
+        # Only what the page itself lists is cached, before any API lookups
+        if tracks:
+            save_cached('tracks', url, tracks, etag)
         
         # Return track metadata for main.py to download
-        return tracks_with_urls
+        return resolve_tracks(tracks, max_workers)
         
     except Exception as e:
         print(f"Error during Plyr scraping: {e}")
@@ -0,0 +1,18 @@
+"""
+Shared HTTP session for plugin detection and the scrapers.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Keep-alive connections reused across page fetches and API calls
+HTTP_POOL_SIZE = 32
+
+# Retry transient gateway errors with a short backoff
+HTTP_RETRY = Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+
+PAGE_SESSION = requests.Session()
+PAGE_SESSION.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+_adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=HTTP_RETRY)
+PAGE_SESSION.mount('http://', _adapter)
+PAGE_SESSION.mount('https://', _adapter)
@@ -1,13 +1,26 @@
-import requests
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+import os
+from urllib.parse import urljoin, urlparse
 
+try:
+    from scrapers.parsing import HTML_PARSER, AUDIO_LINK_SELECTOR, AudioLinkFilter, audio_extension
+    from scrapers.session import PAGE_SESSION
+except ImportError:
+    # Running this file directly puts scrapers/ itself on the path
+    from parsing import HTML_PARSER, AUDIO_LINK_SELECTOR, AudioLinkFilter, audio_extension
+    from session import PAGE_SESSION
 
-def scrape(url, prefix=None, directory=None):
+
+def scrape(url, prefix=None, directory=None, prefetched_response=None, max_workers=None):
     """
     Extract direct audio file links from a webpage.
     Supports: MP3, M4A, AAC, OGG, OPUS, WebM, WAV, FLAC
     
+    A response already fetched for the page (e.g. during plugin detection)
+    can be passed as prefetched_response to skip fetching it again.
+    max_workers is accepted for a uniform scraper interface; the links come
+    from a single page, so there are no parallel requests to size.
+    
     Returns:
         List of track dictionaries with 'url', 'name', and 'track_num' keys,
         or None if scraping fails.
@@ -17,25 +30,18 @@ def scrape(url, prefix=None, directory=None):
     print("Fetching page content...")
     
     try:
-        # Fetch the page
-        response = requests.get(url)
-        response.raise_for_status()
-        
-        # Parse the HTML content
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Define supported audio extensions
-        audio_extensions = ('.mp3', '.m4a', '.aac', '.ogg', '.opus', '.webm', '.wav', '.flac')
+        # Fetch the page unless it was already fetched
+        response = prefetched_response
+        if response is None:
+            response = PAGE_SESSION.get(url, timeout=30)
+            response.raise_for_status()
         
-        # Find all <a> tags with href ending in audio extensions
-        href_elements = soup.find_all('a', href=lambda href: href and any(href.lower().endswith(ext) for ext in audio_extensions))
+        # Parse the HTML content, building only the audio link elements
+        soup = BeautifulSoup(response.content, HTML_PARSER, parse_only=AudioLinkFilter())
         
-        # Also find elements with data-url attribute ending in audio extensions
+        # Find <a> tags with audio hrefs and elements with audio data-url attributes
         # Some sites use data-url instead of href for audio links
-        data_url_elements = soup.find_all(attrs={'data-url': lambda url: url and any(url.lower().endswith(ext) for ext in audio_extensions)})
-        
-        # Combine both types of elements
-        elements = href_elements + data_url_elements
+        elements = AUDIO_LINK_SELECTOR.select(soup)
         
         print(f"Found {len(elements)} audio elements to process on the page.")
         
@@ -43,29 +49,36 @@ def scrape(url, prefix=None, directory=None):
         tracks = []
         audio_count = 0
         
+        # Root-relative links only need the page's origin prepended
+        base = urlparse(url)
+        origin = f"{base.scheme}://{base.netloc}"
+        
         for element in elements:
             # Get the URL from either href or data-url
             url_value = element.get('href') or element.get('data-url')
+            file_ext = audio_extension(url_value)
             
-            if url_value is not None and any(url_value.lower().endswith(ext) for ext in audio_extensions):
+            if file_ext:
                 audio_count += 1
-                # Make sure the url_value is an absolute URL
-                url_value = urljoin(url, url_value)
-                
-                # Extract original filename from URL
-                original_filename = url_value.split('/')[-1]
+                # Make sure the url_value is an absolute URL, skipping urljoin
+                # for links that are already absolute or simply root-relative
+                if url_value.startswith('/') and not url_value.startswith('//') and '/.' not in url_value:
+                    url_value = origin + url_value
+                elif not url_value.startswith(('http://', 'https://')):
+                    url_value = urljoin(url, url_value)
                 
-                # Get file extension
-                file_ext = next(ext for ext in audio_extensions if original_filename.lower().endswith(ext))
+                # Extract original filename from the URL path, leaving out any query string.
+                # Links like dl.php?file=ch1.mp3 carry the extension only in the query,
+                # so they get a numbered name that stays unique and keeps the extension.
+                original_filename = os.path.basename(urlparse(url_value).path)
+                if not audio_extension(original_filename):
+                    original_filename = f"track_{audio_count:03d}{file_ext}"
                 
                 # Try to get a display name from the element text
                 display_name = element.get_text(strip=True)
                 if not display_name:
                     # Use filename without extension as display name
-                    display_name = original_filename
-                    for ext in audio_extensions:
-                        display_name = display_name.replace(ext, '')
-                        display_name = display_name.replace(ext.upper(), '')
+                    display_name = os.path.splitext(original_filename)[0]
                 
                 tracks.append({
                     'url': url_value,
@@ -20,6 +20,21 @@ INTERNAL_NETWORKS = [
     ipaddress.ip_network('fe80::/10'),
 ]
 
+# The same ranges as (network, netmask) integers per IP version, so a lookup
+# is a mask and compare instead of an ip_network membership test
+INTERNAL_RANGES = {
+    version: [
+        (int(network.network_address), int(network.netmask))
+        for network in INTERNAL_NETWORKS if network.version == version
+    ]
+    for version in (4, 6)
+}
+
+# Hostnames that could be IP literals (parsed hostnames are lowercase); any
+# other name skips ipaddress parsing and its ValueError
+IP_LITERAL_SHAPE = re.compile(r'[0-9a-f.:]+(?:%.*)?')
+LOCALHOST_NAMES = {'localhost', '127.0.0.1', '::1'}
+
 def validate_url(url: str) -> bool:
     """Validate URL for security issues."""
     try:
@@ -34,17 +49,23 @@ def validate_url(url: str) -> bool:
             return False
         
         # Check for internal IPs
-        try:
+        hostname = parsed.hostname
+        ip = None
+        if IP_LITERAL_SHAPE.fullmatch(hostname):
             # Try to parse as IP address
-            ip = ipaddress.ip_address(parsed.hostname)
-            for network in INTERNAL_NETWORKS:
-                if ip in network:
+            try:
+                ip = ipaddress.ip_address(hostname)
+            except ValueError:
+                pass
+        
+        if ip is not None:
+            ip_int = int(ip)
+            for network, netmask in INTERNAL_RANGES[ip.version]:
+                if ip_int & netmask == network:
                     return False
-        except ValueError:
+        elif hostname.lower() in LOCALHOST_NAMES:
             # Not an IP address, check for localhost variants
-            hostname_lower = parsed.hostname.lower()
-            if hostname_lower in ['localhost', '127.0.0.1', '::1']:
-                return False
+            return False
         
         # Block file:// and other dangerous schemes
         if parsed.scheme in ['file', 'ftp', 'sftp', 'ssh']:
@@ -54,16 +75,25 @@ def validate_url(url: str) -> bool:
     except Exception:
         return False
 
+# Filename sanitization patterns, compiled once at import
+UNSAFE_CHARS = re.compile(r'[^\w\s\-\.]')
+DOT_RUNS = re.compile(r'\.+')
+# ASCII characters UNSAFE_CHARS would strip, deleted in a single str.translate pass
+UNSAFE_ASCII = str.maketrans('', '', ''.join(c for c in map(chr, range(128)) if UNSAFE_CHARS.match(c)))
+
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename to prevent directory traversal."""
     # Remove any directory components
     filename = os.path.basename(filename)
     
-    # Remove any potentially dangerous characters
-    filename = re.sub(r'[^\w\s\-\.]', '', filename)
+    # Remove any potentially dangerous characters (translate is equivalent for pure ASCII)
+    if filename.isascii():
+        filename = filename.translate(UNSAFE_ASCII)
+    else:
+        filename = UNSAFE_CHARS.sub('', filename)
     
     # Remove multiple dots to prevent extension confusion
-    filename = re.sub(r'\.+', '.', filename)
+    filename = DOT_RUNS.sub('.', filename)
     
     # Remove leading/trailing dots and spaces
     filename = filename.strip('. ')
@@ -82,20 +112,22 @@ def sanitize_filename(filename: str) -> str:
 
 def validate_safe_path(base_dir: str, user_path: str) -> str:
     """Validate that a path stays within the base directory."""
-    # Get absolute paths
-    base_dir = os.path.abspath(base_dir)
-    full_path = os.path.abspath(os.path.join(base_dir, user_path))
+    # Get absolute paths with any symlinks resolved
+    base_dir = os.path.realpath(base_dir)
+    full_path = os.path.realpath(os.path.join(base_dir, user_path))
     
-    # Ensure the full path starts with the base directory
-    if not full_path.startswith(base_dir + os.sep) and full_path != base_dir:
+    # Ensure the full path lies inside the base directory, comparing whole components
+    if os.path.commonpath([base_dir, full_path]) != base_dir:
         raise ValueError("Invalid path: attempted directory traversal")
     
     return full_path
 
+# Job IDs are UUIDs, checked against a pattern compiled once at import
+JOB_ID_PATTERN = re.compile(
+    r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$',
+    re.IGNORECASE
+)
+
 def is_valid_job_id(job_id: str) -> bool:
     """Validate job ID format (UUID)."""
-    uuid_pattern = re.compile(
-        r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$',
-        re.IGNORECASE
-    )
-    return bool(uuid_pattern.match(job_id))
\ No newline at end of file
+    return bool(JOB_ID_PATTERN.match(job_id))
\ No newline at end of file
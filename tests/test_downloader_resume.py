@@ -0,0 +1,154 @@
+"""
+Regression tests for resuming downloads that were cut off mid-body, and
+for downloading when the server's HEAD requests fail.
+"""
+import os
+import re
+import asyncio
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import downloader
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Serve the server's body with Range support, optionally dropping the connection early."""
+    
+    def do_HEAD(self):
+        if self.server.fail_head:
+            # Hang up without answering
+            self.close_connection = True
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(self.server.body)))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.end_headers()
+    
+    def do_GET(self):
+        body = self.server.body
+        start, end = 0, len(body) - 1
+        match = re.match(r'bytes=(\d+)-(\d*)', self.headers.get('Range', ''))
+        if match:
+            start = int(match.group(1))
+            if start >= len(body):
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{len(body)}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            if match.group(2):
+                end = min(int(match.group(2)), end)
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{len(body)}')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.end_headers()
+        
+        # Promise the whole range, then hang up after drop_after bytes
+        payload = body[start:end + 1]
+        if self.server.drop_after is not None:
+            payload = payload[:self.server.drop_after]
+        self.wfile.write(payload)
+        self.wfile.flush()
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class FetchToFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), RangeHandler)
+        self.server.drop_after = None
+        self.server.fail_head = False
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/track.mp3'
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'track.mp3')
+    
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+    
+    def serve(self, size, drop_after=None):
+        self.server.body = os.urandom(size)
+        self.server.drop_after = drop_after
+    
+    def assert_partial(self, received):
+        """The interrupted attempt may only leave a prefix of the bytes it received."""
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(self.path + downloader.SEGMENTS_SUFFIX))
+        with open(self.path + downloader.PART_SUFFIX, 'rb') as f:
+            partial = f.read()
+        self.assertLessEqual(len(partial), received)
+        self.assertEqual(partial, self.server.body[:len(partial)])
+    
+    def assert_complete(self):
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), self.server.body)
+        self.assertFalse(os.path.exists(self.path + downloader.PART_SUFFIX))
+    
+    def fetch_async(self):
+        async def run():
+            try:
+                return await downloader.fetch_to_file_async(downloader.get_shared_session(), self.url, self.path)
+            finally:
+                await downloader.close_shared_session()
+        return asyncio.run(run())
+    
+    def test_threaded_resume_after_dropped_connection(self):
+        self.serve(300 * 1024, drop_after=100 * 1024)
+        with self.assertRaises(Exception):
+            downloader.fetch_to_file(self.url, self.path)
+        self.assert_partial(100 * 1024)
+        
+        self.server.drop_after = None
+        self.assertEqual(downloader.fetch_to_file(self.url, self.path), len(self.server.body))
+        self.assert_complete()
+    
+    def test_async_resume_after_dropped_connection(self):
+        self.serve(300 * 1024, drop_after=100 * 1024)
+        with self.assertRaises(Exception):
+            self.fetch_async()
+        self.assert_partial(100 * 1024)
+        
+        self.server.drop_after = None
+        self.assertEqual(self.fetch_async(), len(self.server.body))
+        self.assert_complete()
+    
+    def test_segmented_resume_after_dropped_connection(self):
+        # Every segment and the single-stream fallback are cut short
+        self.serve(downloader.SEGMENTED_MIN_SIZE, drop_after=64 * 1024)
+        with self.assertRaises(Exception):
+            self.fetch_async()
+        self.assert_partial(64 * 1024)
+        
+        self.server.drop_after = None
+        self.assertEqual(self.fetch_async(), len(self.server.body))
+        self.assert_complete()
+    
+    def test_threaded_download_when_head_fails(self):
+        # A stale finished file can't be checked, so it is downloaded again
+        self.serve(300 * 1024)
+        self.server.fail_head = True
+        with open(self.path, 'wb') as f:
+            f.write(b'stale')
+        self.assertEqual(downloader.fetch_to_file(self.url, self.path), len(self.server.body))
+        self.assert_complete()
+    
+    def test_async_download_when_head_fails(self):
+        self.serve(300 * 1024)
+        self.server.fail_head = True
+        with open(self.path, 'wb') as f:
+            f.write(b'stale')
+        self.assertEqual(self.fetch_async(), len(self.server.body))
+        self.assert_complete()
+
+
+if __name__ == '__main__':
+    unittest.main()